@@ -11,7 +11,7 @@ document.addEventListener("DOMContentLoaded", () => {
   /* ================= AUTH FETCH ================= */
   const getAdminKey = () => localStorage.getItem(ADMIN_KEY_NAME);
 
-  async function adminFetch(url, options = {}) {
+  async function adminResponse(url, options = {}) {
   const key = getAdminKey();
 
   const res = await fetch(url, {
@@ -35,9 +35,13 @@ document.addEventListener("DOMContentLoaded", () => {
     throw new Error(txt || "API Error");
   }
 
-  return res.json();
+  return res;
 }
 
+  async function adminFetch(url, options = {}) {
+    const res = await adminResponse(url, options);
+    return res.json();
+  }
 
   /* ================= DOM ================= */
   const listEl = document.getElementById("reservationList");
@@ -49,6 +53,16 @@ document.addEventListener("DOMContentLoaded", () => {
   const sortDate = document.getElementById("sortDate");
   const sortTime = document.getElementById("sortTime");
 
+  const loadMoreBtn = document.getElementById("loadMore");
+
+  /* ================= PAGING ================= */
+  // The list endpoint is keyset-paginated (newest dates first): show one
+  // page and fetch the next one only when "Load more" is clicked
+  let rows = [];
+  let nextCursor = null;
+  let listParams = null;
+  let listVersion = 0; // bumped on every filter change
+
   /* ================= LOAD LOCATIONS ================= */
   async function loadLocations() {
     try {
@@ -67,44 +81,75 @@ document.addEventListener("DOMContentLoaded", () => {
   }
 
   /* ================= LOAD RESERVATIONS ================= */
-  async function loadReservations() {
-    try {
-      const params = new URLSearchParams();
+  async function fetchPage() {
+    const version = listVersion;
+    const params = new URLSearchParams(listParams);
+    if (nextCursor) params.set("cursor", nextCursor);
 
-      if (filterDate.value) params.append("reservation_date", filterDate.value);
-      if (filterLocation.value) params.append("location_id", filterLocation.value);
-      if (filterStatus.value) params.append("status", filterStatus.value);
+    const res = await adminResponse(`${API_BASE}/reservations/?${params.toString()}`);
+    const page = await res.json();
+    if (version !== listVersion) return; // filters changed meanwhile
 
-      const data = await adminFetch(
-        `${API_BASE}/reservations/?${params.toString()}`
-      );
+    rows.push(...page);
+    nextCursor = res.headers.get("X-Next-Cursor");
 
-      const sorted = data.sort((a, b) => {
-        // Sort by date
-        if (sortDate.value === "asc") {
-          if (a.reservation_date !== b.reservation_date) {
-            return a.reservation_date.localeCompare(b.reservation_date);
-          }
-        } else {
-          if (a.reservation_date !== b.reservation_date) {
-            return b.reservation_date.localeCompare(a.reservation_date);
-          }
-        }
+    loadMoreBtn.hidden = !nextCursor;
+    renderList(sortRows(rows));
+  }
 
-        // Sort by time
-        if (sortTime.value === "asc") {
-          return a.reservation_time.localeCompare(b.reservation_time);
-        }
-        return b.reservation_time.localeCompare(a.reservation_time);
-      });
+  async function loadReservations() {
+    listVersion += 1;
+    rows = [];
+    nextCursor = null;
+    listParams = new URLSearchParams();
+
+    if (filterDate.value) listParams.append("reservation_date", filterDate.value);
+    if (filterLocation.value) listParams.append("location_id", filterLocation.value);
+    if (filterStatus.value) listParams.append("status", filterStatus.value);
 
-      renderList(sorted);
+    try {
+      await fetchPage();
     } catch (err) {
       console.error("Failed to load reservations", err);
+      loadMoreBtn.hidden = true;
       listEl.innerHTML = `<p class="empty">Failed to load reservations</p>`;
     }
   }
 
+  async function loadMore() {
+    loadMoreBtn.disabled = true;
+    try {
+      await fetchPage();
+    } catch (err) {
+      console.error("Failed to load more reservations", err);
+      alert("Failed to load more reservations");
+    } finally {
+      loadMoreBtn.disabled = false;
+    }
+  }
+
+  // sorts the rows loaded so far, not the whole history
+  function sortRows(data) {
+    return [...data].sort((a, b) => {
+      // Sort by date
+      if (sortDate.value === "asc") {
+        if (a.reservation_date !== b.reservation_date) {
+          return a.reservation_date.localeCompare(b.reservation_date);
+        }
+      } else {
+        if (a.reservation_date !== b.reservation_date) {
+          return b.reservation_date.localeCompare(a.reservation_date);
+        }
+      }
+
+      // Sort by time
+      if (sortTime.value === "asc") {
+        return a.reservation_time.localeCompare(b.reservation_time);
+      }
+      return b.reservation_time.localeCompare(a.reservation_time);
+    });
+  }
+
   /* ================= RENDER LIST ================= */
   function renderList(data) {
   listEl.innerHTML = "";
@@ -200,11 +245,16 @@ document.addEventListener("DOMContentLoaded", () => {
   /* ================= UPDATE STATUS ================= */
   async function updateStatus(id, status) {
     try {
-      await adminFetch(
+      const updated = await adminFetch(
         `${API_BASE}/reservations/${id}/status?status=${status}`,
         { method: "PATCH" }
       );
-      await loadReservations();
+      // patch the loaded pages in place; reloading would drop every
+      // page after the first
+      rows = rows
+        .map(r => (r.id === updated.id ? updated : r))
+        .filter(r => !filterStatus.value || r.status === filterStatus.value);
+      renderList(sortRows(rows));
     } catch (err) {
       console.error("Failed to update status", err);
       alert("Failed to update reservation");
@@ -217,11 +267,16 @@ document.addEventListener("DOMContentLoaded", () => {
   [
     filterDate,
     filterLocation,
-    filterStatus,
-    sortDate,
-    sortTime
+    filterStatus
   ].forEach(el => el?.addEventListener("change", loadReservations));
 
+  // re-sorting only needs the rows already loaded
+  [sortDate, sortTime].forEach(el =>
+    el?.addEventListener("change", () => renderList(sortRows(rows)))
+  );
+
+  loadMoreBtn?.addEventListener("click", loadMore);
+
   // Delegated action buttons
   listEl?.addEventListener("click", e => {
     const btn = e.target.closest("button[data-action]");
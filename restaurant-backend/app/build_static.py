@@ -0,0 +1,96 @@
+"""
+Build the self-hosted frontend bundle.
+
+    python -m app.build_static [--src ..] [--out static_dist]
+
+css/*.css and js/*.js get a content hash in their name, the HTML pages
+are rewritten to point at those names, and every text file is written
+alongside .gz and .br versions for PrecompressedStaticFiles. assets/ is
+copied as-is (images are already compressed).
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import re
+import shutil
+from pathlib import Path
+
+import brotli
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+FRONTEND_DIR = BASE_DIR.parent
+DIST_DIR = BASE_DIR / "static_dist"
+
+FINGERPRINT_DIRS = ("css", "js")
+COPY_DIRS = ("assets",)
+COMPRESS_SUFFIXES = {".html", ".css", ".js", ".json", ".svg"}
+
+# href="css/style.css" / src="js/menu.js" (optionally ./-prefixed)
+ASSET_REF = re.compile(r'(?P<attr>(?:href|src)=["\'])(?:\./)?(?P<path>(?:css|js)/[^"\'?#]+)')
+
+
+def _fingerprint(path: Path, src: Path, out: Path) -> str:
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()[:10]
+    relative = path.relative_to(src)
+    hashed = relative.with_name(f"{path.stem}.{digest}{path.suffix}")
+
+    target = out / hashed
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(data)
+    return hashed.as_posix()
+
+
+def _compress(path: Path):
+    data = path.read_bytes()
+    # mtime=0 keeps the .gz byte-identical between builds
+    with open(f"{path}.gz", "wb") as raw, gzip.GzipFile(
+        fileobj=raw, mode="wb", compresslevel=9, mtime=0
+    ) as gz:
+        gz.write(data)
+    Path(f"{path}.br").write_bytes(
+        brotli.compress(data, mode=brotli.MODE_TEXT, quality=11)
+    )
+
+
+def build(src: Path = FRONTEND_DIR, out: Path = DIST_DIR) -> dict:
+    if out.exists():
+        shutil.rmtree(out)
+    out.mkdir(parents=True)
+
+    manifest = {}
+    for folder in FINGERPRINT_DIRS:
+        for path in sorted((src / folder).rglob("*")):
+            if path.is_file():
+                manifest[path.relative_to(src).as_posix()] = _fingerprint(path, src, out)
+
+    for folder in COPY_DIRS:
+        if (src / folder).is_dir():
+            shutil.copytree(src / folder, out / folder)
+
+    def rewrite(match):
+        path = match.group("path")
+        return match.group("attr") + manifest.get(path, path)
+
+    for page in sorted(src.glob("*.html")):
+        html = page.read_text(encoding="utf-8")
+        (out / page.name).write_text(ASSET_REF.sub(rewrite, html), encoding="utf-8")
+
+    (out / "manifest.json").write_text(json.dumps(manifest, indent=2))
+
+    for path in sorted(out.rglob("*")):
+        if path.is_file() and path.suffix in COMPRESS_SUFFIXES:
+            _compress(path)
+
+    return manifest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--src", type=Path, default=FRONTEND_DIR)
+    parser.add_argument("--out", type=Path, default=DIST_DIR)
+    args = parser.parse_args()
+
+    manifest = build(args.src, args.out)
+    print(f"Built {len(manifest)} fingerprinted files into {args.out}")
@@ -0,0 +1,124 @@
+import hashlib
+import threading
+
+import orjson
+from fastapi import Request
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from .invalidation import bus
+
+# ======================================================
+# CATALOG CACHE (IN-PROCESS SNAPSHOT)
+# ======================================================
+class CatalogCache:
+    """
+    Snapshot cache for public catalog reads (menu, locations, events).
+
+    Every write bumps `version`; a snapshot is only served while it was
+    built against the current version, so an admin change is visible on
+    the very next request. Invalidations go through the bus so that
+    other workers drop their copy too.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.version = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+        CACHES[name] = self
+
+    async def get_or_load(self, key, loader):
+        version = self.version
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        value = await loader()
+
+        with self._lock:
+            # a write landed while we were loading -> don't keep stale data
+            if self.version == version:
+                self._entries[key] = (version, value)
+        return value
+
+    def invalidate(self):
+        bus.publish(self.name)
+
+    def _drop(self):
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+
+def _on_invalidate(name):
+    # name=None -> drop everything (e.g. listener reconnected)
+    targets = CACHES.values() if name is None else [CACHES.get(name)]
+    for cache in targets:
+        if cache is not None:
+            cache._drop()
+
+
+CACHES = {}
+bus.subscribe(_on_invalidate)
+
+menu_cache = CatalogCache("menu")
+location_cache = CatalogCache("locations")
+event_cache = CatalogCache("events")
+
+
+# ======================================================
+# CONDITIONAL RESPONSES (ETAG / 304)
+# ======================================================
+# no-cache: the browser keeps its copy but revalidates on every fetch(),
+# so admin pages reloading right after a save never see a stale list
+CATALOG_CACHE_CONTROL = "no-cache"
+
+
+def _orjson_default(value):
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    raise TypeError
+
+
+def _render(payload):
+    body = orjson.dumps(payload, default=_orjson_default)
+    etag = '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+    return body, etag
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {
+        tag.strip().removeprefix("W/")
+        for tag in header.split(",")
+    }
+    return etag in candidates
+
+
+async def cached_json_response(request: Request, cache: CatalogCache, key, loader):
+    """
+    Serve `await loader()` as JSON through `cache`, keyed by a content
+    hash ETag.
+
+    The body is rendered once per cache version; clients that send a
+    matching If-None-Match get an empty 304.
+    """
+    async def load():
+        return _render(await loader())
+
+    body, etag = await cache.get_or_load(key, load)
+    headers = {"ETag": etag, "Cache-Control": CATALOG_CACHE_CONTROL}
+
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers=headers,
+    )
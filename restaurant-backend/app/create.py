@@ -1,4 +0,0 @@
-from .database import engine
-from .models import Base
-
-Base.metadata.create_all(bind=engine)
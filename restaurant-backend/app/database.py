@@ -1,5 +1,7 @@
 import os
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 # ======================================================
@@ -39,6 +41,40 @@ if ENV == "production":
 
 engine = create_engine(DATABASE_URL, **engine_args)
 
+# ======================================================
+# ASYNC ENGINE (asyncpg / aiosqlite)
+# ======================================================
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(url: str):
+    parsed = make_url(url)
+    backend = parsed.drivername.split("+", 1)[0]
+
+    if backend not in ASYNC_DRIVERS:
+        raise RuntimeError(f"No async driver configured for '{backend}'")
+
+    # asyncpg doesn't understand libpq's sslmode query param
+    query = {k: v for k, v in parsed.query.items() if k != "sslmode"}
+    return parsed.set(drivername=ASYNC_DRIVERS[backend], query=query)
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+
+async_engine_args = {
+    key: value
+    for key, value in engine_args.items()
+    if key not in ("future", "connect_args")
+}
+if ENV == "production" and DATABASE_URL.startswith("postgresql"):
+    async_engine_args["connect_args"] = {"ssl": "require"}
+
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **async_engine_args)
+
 # ======================================================
 # SESSION
 # ======================================================
@@ -49,6 +85,12 @@ SessionLocal = sessionmaker(
     expire_on_commit=False,
 )
 
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 # ======================================================
 # BASE MODEL
 # ======================================================
@@ -63,3 +105,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
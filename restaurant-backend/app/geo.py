@@ -0,0 +1,88 @@
+import heapq
+import math
+
+# ======================================================
+# DISTANCE
+# ======================================================
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+
+    a = (
+        math.sin(dphi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _unit_vector(lat: float, lng: float) -> tuple[float, float, float]:
+    phi, lmb = math.radians(lat), math.radians(lng)
+    return (
+        math.cos(phi) * math.cos(lmb),
+        math.cos(phi) * math.sin(lmb),
+        math.sin(phi)
+    )
+
+
+# ======================================================
+# K-D TREE (NEAREST BRANCHES)
+# ======================================================
+class NearestIndex:
+    """
+    k-d tree over points on the unit sphere.
+
+    Straight-line (chord) distance between unit vectors grows with the
+    great-circle distance, so nearest-by-chord is nearest-by-haversine,
+    with no special cases at the poles or the antimeridian.
+    """
+
+    def __init__(self, items: list, lat=lambda i: i.lat, lng=lambda i: i.lng):
+        points = [(_unit_vector(lat(item), lng(item)), item) for item in items]
+        self._root = self._build(points, 0)
+        self._size = len(points)
+
+    def __len__(self):
+        return self._size
+
+    def _build(self, points, depth):
+        if not points:
+            return None
+        axis = depth % 3
+        points.sort(key=lambda p: p[0][axis])
+        mid = len(points) // 2
+        return (
+            points[mid],
+            axis,
+            self._build(points[:mid], depth + 1),
+            self._build(points[mid + 1:], depth + 1)
+        )
+
+    def nearest(self, lat: float, lng: float, k: int) -> list:
+        target = _unit_vector(lat, lng)
+        best = []  # max-heap of (-dist2, tiebreak, item)
+
+        def visit(node):
+            if node is None:
+                return
+            (point, item), axis, left, right = node
+
+            dist2 = sum((a - b) ** 2 for a, b in zip(point, target))
+            entry = (-dist2, id(item), item)
+            if len(best) < k:
+                heapq.heappush(best, entry)
+            elif dist2 < -best[0][0]:
+                heapq.heapreplace(best, entry)
+
+            diff = target[axis] - point[axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            visit(near)
+            if len(best) < k or diff ** 2 < -best[0][0]:
+                visit(far)
+
+        if k > 0:
+            visit(self._root)
+        return [item for _, _, item in sorted(best, reverse=True)]
@@ -0,0 +1,152 @@
+import io
+import re
+
+from PIL import ExifTags, Image, ImageOps
+
+# ======================================================
+# RESPONSIVE VARIANTS
+# ======================================================
+VARIANT_WIDTHS = {
+    "thumb": 320,
+    "card": 640,
+    "hero": 1280,
+}
+WEBP_QUALITY = 80
+
+# decoded RGBA at this size is ~160 MB; Pillow's own bomb check only
+# starts at ~179 MP
+MAX_IMAGE_PIXELS = 40_000_000
+
+# the stored original is re-encoded too, so no EXIF/GPS leaves the server
+ORIGINAL_FORMATS = {
+    "jpg": ("JPEG", {"quality": 92, "optimize": True}),
+    "png": ("PNG", {"optimize": True}),
+    "webp": ("WEBP", {"quality": 90, "method": 4}),
+}
+
+# modes whose ICC profile still fits after conversion to RGB / RGBA
+ICC_MODES = {"RGB", "RGBA", "RGBX", "P", "PA"}
+
+# images/<key>/original.<ext> + images/<key>/<variant>.webp
+_ORIGINAL_URL = re.compile(r"^(?P<base>.+/images/[^/]+/)original\.\w+$")
+
+
+def original_path(key: str, ext: str) -> str:
+    return f"images/{key}/original.{ext}"
+
+
+def variant_path(key: str, name: str) -> str:
+    return f"images/{key}/{name}.webp"
+
+
+def _check_size(img):
+    # Image.open only reads the header, so this runs before any decoding
+    width, height = img.size
+    if width * height > MAX_IMAGE_PIXELS:
+        raise Image.DecompressionBombError(
+            f"{width}x{height} exceeds {MAX_IMAGE_PIXELS} pixels"
+        )
+
+
+def _display_width(img) -> int:
+    # EXIF orientations 5-8 turn the image by 90 degrees
+    orientation = img.getexif().get(ExifTags.Base.Orientation, 1)
+    return img.height if orientation in (5, 6, 7, 8) else img.width
+
+
+def read_width(source) -> int:
+    """Upright width of an upload, from its header only."""
+    source.seek(0)
+    with Image.open(source) as img:
+        _check_size(img)
+        return _display_width(img)
+
+
+def variant_widths(source_width: int) -> dict[str, int]:
+    """Real pixel width of each variant; images are never upscaled."""
+    return {
+        name: min(width, source_width)
+        for name, width in VARIANT_WIDTHS.items()
+    }
+
+
+def _encode(img, fmt: str, **options) -> bytes:
+    buffer = io.BytesIO()
+    img.save(buffer, fmt, **options)
+    return buffer.getvalue()
+
+
+def make_variants(source, ext: str) -> tuple[bytes, dict[str, bytes], int]:
+    """
+    Re-encode an upload (binary file object): a clean original in its
+    own format plus WebP at each VARIANT_WIDTHS width. Also returns the
+    upright width, for variant_widths().
+
+    EXIF orientation is applied first, then dropped together with all
+    other metadata (GPS included; only an RGB ICC profile is kept on the
+    original). Images are never upscaled. Raises
+    PIL.Image.DecompressionBombError above MAX_IMAGE_PIXELS and
+    PIL.UnidentifiedImageError / OSError for anything Pillow can't decode.
+    """
+    variants = {}
+
+    source.seek(0)
+    with Image.open(source) as img:
+        _check_size(img)
+        # a CMYK / grayscale profile no longer describes the RGB pixels
+        # we write, so only RGB-based modes keep theirs
+        icc_profile = None
+        if img.mode in ICC_MODES:
+            icc_profile = img.info.get("icc_profile")
+
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in ("RGB", "RGBA"):
+            has_alpha = "A" in img.getbands() or "transparency" in img.info
+            img = img.convert("RGBA" if has_alpha else "RGB")
+
+        fmt, options = ORIGINAL_FORMATS[ext]
+        if icc_profile:
+            options = {**options, "icc_profile": icc_profile}
+        original = _encode(img, fmt, **options)
+
+        for name, width in VARIANT_WIDTHS.items():
+            variant = img.copy()
+            if variant.width > width:
+                height = round(variant.height * width / variant.width)
+                variant = variant.resize((width, height), Image.Resampling.LANCZOS)
+
+            variants[name] = _encode(
+                variant, "WEBP", quality=WEBP_QUALITY, method=4
+            )
+
+    return original, variants, img.width
+
+
+def image_variants(url: str | None) -> dict[str, str] | None:
+    """Variant URLs for an image stored by the upload pipeline, else None."""
+    if not url:
+        return None
+
+    match = _ORIGINAL_URL.match(url)
+    if not match:
+        return None  # legacy upload / external URL -> original only
+
+    base = match.group("base")
+    return {name: f"{base}{name}.webp" for name in VARIANT_WIDTHS}
+
+
+def image_srcset(variants: dict[str, str] | None,
+                 widths: dict[str, int]) -> str | None:
+    """
+    srcset with the real width of each variant (see variant_widths).
+
+    Variants of a small image can share a width; only the first (the
+    smallest file) is listed.
+    """
+    if not variants:
+        return None
+
+    entries = {}
+    for name, url in variants.items():
+        entries.setdefault(widths[name], url)
+    return ", ".join(f"{url} {width}w" for width, url in entries.items())
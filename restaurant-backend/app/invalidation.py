@@ -0,0 +1,152 @@
+import logging
+import os
+import select
+import threading
+import uuid
+
+from sqlalchemy import text
+
+from .database import engine
+
+logger = logging.getLogger(__name__)
+
+# ======================================================
+# CONFIG
+# ======================================================
+CHANNEL = "catalog_invalidation"
+CACHE_BUS = os.getenv("CACHE_BUS")  # "local" | "postgres" (default: by dialect)
+LISTEN_POLL_SECONDS = 5
+RECONNECT_DELAY_SECONDS = 2
+
+
+# ======================================================
+# LOCAL BUS (SINGLE PROCESS / TESTS)
+# ======================================================
+class LocalInvalidationBus:
+    """Delivers invalidations to subscribers in this process only."""
+
+    def __init__(self):
+        self._handlers = []
+
+    def subscribe(self, handler):
+        self._handlers.append(handler)
+
+    def publish(self, name: str):
+        self._deliver(name)
+
+    def _deliver(self, name: str):
+        for handler in self._handlers:
+            handler(name)
+
+    def _deliver_all(self):
+        for handler in self._handlers:
+            handler(None)
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+# ======================================================
+# POSTGRES BUS (LISTEN / NOTIFY ACROSS WORKERS)
+# ======================================================
+class PostgresInvalidationBus(LocalInvalidationBus):
+    """
+    Fans invalidations out to every worker/replica via LISTEN/NOTIFY.
+
+    The publishing worker invalidates locally right away; the NOTIFY only
+    has to reach the others, so our own messages are ignored on receipt.
+    """
+
+    def __init__(self, engine):
+        super().__init__()
+        self.engine = engine
+        self.sender_id = uuid.uuid4().hex
+        self._stop = threading.Event()
+        self._thread = None
+
+    def publish(self, name: str):
+        self._deliver(name)
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(
+                    text("SELECT pg_notify(:channel, :payload)"),
+                    {"channel": CHANNEL, "payload": f"{self.sender_id}:{name}"}
+                )
+        except Exception:
+            logger.exception("Failed to publish cache invalidation for %s", name)
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._listen_forever,
+            name="catalog-invalidation-listener",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=LISTEN_POLL_SECONDS + 1)
+            self._thread = None
+
+    def _listen_forever(self):
+        while not self._stop.is_set():
+            try:
+                self._listen()
+            except Exception:
+                logger.exception("Cache invalidation listener disconnected")
+                self._stop.wait(RECONNECT_DELAY_SECONDS)
+
+    def _listen(self):
+        # dedicated connection, detached so it never goes back to the pool;
+        # grab the driver connection first, detach() clears it
+        raw = self.engine.raw_connection()
+        conn = raw.driver_connection
+        raw.detach()
+        conn.autocommit = True
+
+        try:
+            with conn.cursor() as cur:
+                cur.execute(f"LISTEN {CHANNEL}")
+
+            # anything published while we were disconnected is lost
+            self._deliver_all()
+
+            while not self._stop.is_set():
+                ready, _, _ = select.select([conn], [], [], LISTEN_POLL_SECONDS)
+                if not ready:
+                    continue
+
+                conn.poll()
+                while conn.notifies:
+                    notify = conn.notifies.pop(0)
+                    sender, _, name = notify.payload.partition(":")
+                    if sender != self.sender_id:
+                        self._deliver(name)
+        finally:
+            conn.close()
+
+
+# ======================================================
+# FACTORY
+# ======================================================
+def create_bus():
+    backend = CACHE_BUS or (
+        "postgres" if engine.dialect.name == "postgresql" else "local"
+    )
+
+    if backend == "postgres":
+        return PostgresInvalidationBus(engine)
+    if backend == "local":
+        return LocalInvalidationBus()
+
+    raise RuntimeError("CACHE_BUS must be 'local' or 'postgres'")
+
+
+bus = create_bus()
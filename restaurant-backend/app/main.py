@@ -1,19 +1,32 @@
 import os
+import asyncio
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from pathlib import Path
+from urllib.parse import urlparse
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 load_dotenv(BASE_DIR / ".env")
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from starlette.datastructures import MutableHeaders
 
 from .routers import menu, location, order, reservation, event
-from fastapi import Request
-from fastapi.responses import Response
+from .invalidation import bus
+from .metrics import metrics
+from .sweeper import run_draft_sweeper
+from .storage import (
+    create_storage,
+    STORAGE_BACKEND,
+    LOCAL_STORAGE_DIR,
+    LOCAL_STORAGE_URL,
+)
+from .static import PrecompressedStaticFiles
+from .deps.admin import admin_guard
+from fastapi import Depends
 
 
 # ======================================================
@@ -24,24 +37,65 @@ ENV = os.getenv("ENV")
 if ENV not in ("development", "production"):
     raise RuntimeError("ENV must be set to 'development' or 'production'")
 
+# ======================================================
+# LIFESPAN
+# ======================================================
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    bus.start()
+    app.state.storage = create_storage()
+    stop_sweeper = asyncio.Event()
+    sweeper = asyncio.create_task(run_draft_sweeper(stop_sweeper))
+    yield
+    stop_sweeper.set()
+    await sweeper
+    if app.state.storage is not None:
+        app.state.storage.close()
+    bus.stop()
+
 # ======================================================
 # APP INIT
 # ======================================================
 app = FastAPI(
     title="APS Restaurant API",
-    debug=(ENV == "development")
+    debug=(ENV == "development"),
+    lifespan=lifespan,
+    # orjson serializes UUID / date / time / datetime natively
+    default_response_class=ORJSONResponse
 )
 
 # ======================================================
 # SECURITY HEADERS
 # ======================================================
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request, call_next):
-        response: Response = await call_next(request)
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["Referrer-Policy"] = "no-referrer"
-        return response
+class SecurityHeadersMiddleware:
+    """
+    Pure ASGI middleware: headers are added to `http.response.start`
+    as it passes through, so there's no extra task or body re-streaming
+    per request (unlike BaseHTTPMiddleware).
+    """
+
+    HEADERS = {
+        "X-Content-Type-Options": "nosniff",
+        "X-Frame-Options": "DENY",
+        "Referrer-Policy": "no-referrer",
+    }
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for key, value in self.HEADERS.items():
+                    headers[key] = value
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
 
 app.add_middleware(SecurityHeadersMiddleware)
 
@@ -51,6 +105,17 @@ app.add_middleware(SecurityHeadersMiddleware)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 ASSETS_DIR = os.path.join(BASE_DIR, "assets")
 
+# local storage backend: serve its bucket where LOCAL_STORAGE_URL points.
+# Mounted before /assets and created here, since LocalStorage only makes
+# the directory in lifespan, after the mount checks have run
+if STORAGE_BACKEND == "local":
+    LOCAL_STORAGE_DIR.mkdir(parents=True, exist_ok=True)
+    app.mount(
+        urlparse(LOCAL_STORAGE_URL).path.rstrip("/"),
+        StaticFiles(directory=LOCAL_STORAGE_DIR),
+        name="uploads"
+    )
+
 if ENV == "development" and os.path.exists(ASSETS_DIR):
     app.mount("/assets", StaticFiles(directory=ASSETS_DIR), name="assets")
 
@@ -80,6 +145,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
 # ======================================================
@@ -98,3 +164,26 @@ app.include_router(event.router)
 @app.get("/health", tags=["system"])
 def health_check():
     return {"status": "ok"}
+
+
+# ======================================================
+# METRICS (ADMIN ONLY)
+# ======================================================
+@app.get("/metrics", tags=["system"], dependencies=[Depends(admin_guard)])
+def get_metrics():
+    return metrics.snapshot()
+
+
+# ======================================================
+# SELF-HOSTED FRONTEND (OPTIONAL)
+# ======================================================
+# build first: python -m app.build_static
+# mounted last so it never shadows the API routes above
+STATIC_DIST_DIR = os.getenv("STATIC_DIST_DIR", os.path.join(BASE_DIR, "static_dist"))
+
+if os.getenv("SERVE_FRONTEND") == "1" and os.path.isdir(STATIC_DIST_DIR):
+    app.mount(
+        "/",
+        PrecompressedStaticFiles(directory=STATIC_DIST_DIR, html=True),
+        name="frontend"
+    )
@@ -0,0 +1,31 @@
+import threading
+from collections import defaultdict
+
+# ======================================================
+# IN-PROCESS METRICS
+# ======================================================
+class Metrics:
+    """Per-worker counters and gauges, exposed at GET /metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(int)
+        self._gauges = {}
+
+    def inc(self, name: str, value: int = 1):
+        with self._lock:
+            self._counters[name] += value
+
+    def set(self, name: str, value):
+        with self._lock:
+            self._gauges[name] = value
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+            }
+
+
+metrics = Metrics()
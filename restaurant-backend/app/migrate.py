@@ -0,0 +1,287 @@
+"""
+Versioned schema migrations.
+
+    python -m app.migrate              apply everything pending
+    python -m app.migrate status       list applied / pending
+    python -m app.migrate stamp 0000   mark as applied without running
+    python -m app.migrate seed         load seed.sql (dev data)
+
+Migrations live in restaurant-backend/migrations as NNNN_name.sql or
+NNNN_name.py and run in version order, each recorded in
+schema_migrations.
+
+A .sql file runs in one transaction unless its first line is
+`-- migrate: no-transaction`; then every statement commits on its own,
+which is what CREATE INDEX CONCURRENTLY needs. Statements are split on
+a trailing `;`, so anything with a dollar-quoted body belongs in a .py
+migration.
+
+A .py migration defines `upgrade(conn)` and may set
+`TRANSACTIONAL = False` to get an autocommit connection, e.g. for
+backfill_in_batches().
+
+The migrations are PostgreSQL (SERIAL, CREATE INDEX CONCURRENTLY,
+pg_constraint). On any other dialect (the SQLite / aiosqlite setup used
+for local runs) `upgrade` builds the schema from app.models with
+create_all instead and stamps the pending versions; that only creates
+missing tables, it never alters existing ones.
+"""
+import importlib.util
+import logging
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+from sqlalchemy import inspect, text
+
+from . import models  # noqa: F401  registers the tables on Base
+from .database import Base, engine
+
+logger = logging.getLogger(__name__)
+
+# ======================================================
+# CONFIG
+# ======================================================
+BASE_DIR = Path(__file__).resolve().parent.parent
+MIGRATIONS_DIR = BASE_DIR / "migrations"
+SEED_FILE = BASE_DIR / "seed.sql"
+
+MIGRATION_FILE = re.compile(r"^(?P<version>\d{4})_(?P<name>\w+)\.(?P<kind>sql|py)$")
+NO_TRANSACTION = "-- migrate: no-transaction"
+BASELINE_VERSION = "0000"
+
+# one runner at a time when several replicas boot together
+ADVISORY_LOCK_KEY = 7_146_331_905
+
+BACKFILL_BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", "1000"))
+BACKFILL_PAUSE_SECONDS = float(os.getenv("MIGRATION_BATCH_PAUSE_SECONDS", "0.1"))
+
+
+# ======================================================
+# DISCOVERY
+# ======================================================
+class Migration:
+    def __init__(self, path: Path):
+        match = MIGRATION_FILE.match(path.name)
+        self.path = path
+        self.version = match.group("version")
+        self.name = match.group("name")
+        self.kind = match.group("kind")
+
+    def __repr__(self):
+        return f"{self.version}_{self.name}"
+
+
+def discover(directory: Path = MIGRATIONS_DIR) -> list[Migration]:
+    migrations = [
+        Migration(path)
+        for path in sorted(directory.iterdir())
+        if MIGRATION_FILE.match(path.name)
+    ]
+
+    versions = [m.version for m in migrations]
+    duplicates = {v for v in versions if versions.count(v) > 1}
+    if duplicates:
+        raise RuntimeError(f"Duplicate migration versions: {sorted(duplicates)}")
+
+    return migrations
+
+
+def split_statements(sql: str) -> list[str]:
+    statements = []
+    for chunk in re.split(r";[ \t]*(?:--[^\n]*)?(?:\r?\n|$)", sql):
+        code = "\n".join(
+            line for line in chunk.splitlines()
+            if not line.strip().startswith("--")
+        ).strip()
+        if code:
+            statements.append(code)
+    return statements
+
+
+# ======================================================
+# BOOKKEEPING
+# ======================================================
+def _ensure_table(conn):
+    conn.exec_driver_sql(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        " version VARCHAR(4) PRIMARY KEY,"
+        " name TEXT NOT NULL,"
+        " applied_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP"
+        ")"
+    )
+
+
+def applied_versions() -> set[str]:
+    with engine.begin() as conn:
+        _ensure_table(conn)
+        rows = conn.execute(text("SELECT version FROM schema_migrations"))
+        return {row.version for row in rows}
+
+
+def _record(conn, migration: Migration):
+    conn.execute(
+        text("INSERT INTO schema_migrations (version, name) VALUES (:v, :n)"),
+        {"v": migration.version, "n": migration.name}
+    )
+
+
+# ======================================================
+# HELPERS FOR MIGRATIONS
+# ======================================================
+def backfill_in_batches(conn, statement: str,
+                        batch_size: int = BACKFILL_BATCH_SIZE,
+                        pause: float = BACKFILL_PAUSE_SECONDS, **params) -> int:
+    """
+    Repeat `statement` until it touches no rows.
+
+    The statement must limit itself with :batch_size, e.g.
+
+        UPDATE events SET status = 'past'
+        WHERE id IN (
+            SELECT id FROM events
+            WHERE status <> 'past' AND end_date < CURRENT_DATE
+            LIMIT :batch_size
+        )
+
+    On the autocommit connection of a TRANSACTIONAL = False migration
+    every batch commits by itself, so row locks never outlive a batch.
+    """
+    total = 0
+    while True:
+        result = conn.execute(text(statement), {"batch_size": batch_size, **params})
+        if result.rowcount <= 0:
+            return total
+        total += result.rowcount
+        logger.info("backfill: %s rows so far", total)
+        time.sleep(pause)
+
+
+# ======================================================
+# RUNNER
+# ======================================================
+def _load_module(migration: Migration):
+    spec = importlib.util.spec_from_file_location(
+        f"migrations.m{migration.version}", migration.path
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _apply(migration: Migration):
+    if migration.kind == "sql":
+        sql = migration.path.read_text(encoding="utf-8")
+        statements = split_statements(sql)
+        transactional = not sql.lstrip().startswith(NO_TRANSACTION)
+
+        def upgrade(conn):
+            for statement in statements:
+                conn.exec_driver_sql(statement)
+    else:
+        module = _load_module(migration)
+        upgrade = module.upgrade
+        transactional = getattr(module, "TRANSACTIONAL", True)
+
+    if transactional:
+        with engine.begin() as conn:
+            upgrade(conn)
+            _record(conn, migration)
+        return
+
+    # a failure part-way leaves earlier statements applied, so these
+    # migrations have to be safe to re-run (IF NOT EXISTS etc.)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        upgrade(conn)
+    with engine.begin() as conn:
+        _record(conn, migration)
+
+
+def _adopt_existing_schema(applied: set[str]):
+    # databases built from the old DATABASEDEPLOY / create_all already
+    # have the baseline schema
+    if applied or not inspect(engine).has_table("events"):
+        return applied
+
+    logger.info("Existing schema found, stamping baseline %s", BASELINE_VERSION)
+    stamp(BASELINE_VERSION)
+    return {BASELINE_VERSION}
+
+
+def _create_from_models() -> list[Migration]:
+    applied = applied_versions()
+    pending = [m for m in discover() if m.version not in applied]
+    if pending:
+        Base.metadata.create_all(engine)
+        stamp(pending[-1].version)
+    return pending
+
+
+def upgrade() -> list[Migration]:
+    if engine.dialect.name != "postgresql":
+        return _create_from_models()
+
+    with engine.connect() as lock_conn:
+        lock_conn.execute(
+            text("SELECT pg_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY}
+        )
+        lock_conn.commit()
+
+        try:
+            applied = _adopt_existing_schema(applied_versions())
+            pending = [m for m in discover() if m.version not in applied]
+
+            for migration in pending:
+                logger.info("Applying migration %r", migration)
+                started = time.monotonic()
+                _apply(migration)
+                logger.info(
+                    "Applied %r in %.1fs", migration, time.monotonic() - started
+                )
+            return pending
+        finally:
+            lock_conn.execute(
+                text("SELECT pg_advisory_unlock(:key)"),
+                {"key": ADVISORY_LOCK_KEY}
+            )
+            lock_conn.commit()
+
+
+def stamp(version: str):
+    applied = applied_versions()
+    with engine.begin() as conn:
+        for migration in discover():
+            if migration.version <= version and migration.version not in applied:
+                _record(conn, migration)
+
+
+def seed(path: Path = SEED_FILE):
+    with engine.begin() as conn:
+        for statement in split_statements(path.read_text(encoding="utf-8")):
+            conn.exec_driver_sql(statement)
+
+
+def status():
+    applied = applied_versions()
+    for migration in discover():
+        mark = "applied" if migration.version in applied else "pending"
+        print(f"{mark:8} {migration!r}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    command, *args = sys.argv[1:] or ["upgrade"]
+
+    if command == "upgrade":
+        applied_now = upgrade()
+        print(f"Applied {len(applied_now)} migration(s)")
+    elif command == "status":
+        status()
+    elif command == "stamp" and len(args) == 1:
+        stamp(args[0])
+    elif command == "seed":
+        seed()
+    else:
+        sys.exit(__doc__)
@@ -58,6 +58,13 @@ class MenuItem(Base):
 
     __table_args__ = (
         Index("idx_menu_items_category", "category_id"),
+        # get_menu: WHERE is_active ORDER BY id
+        Index(
+            "idx_menu_items_active",
+            "id",
+            postgresql_where=is_active.is_(True),
+            sqlite_where=is_active.is_(True)
+        ),
     )
 
 
@@ -286,11 +293,21 @@ class Location(Base):
     maps_url = Column(String)
     is_active = Column(Boolean, default=True)
 
+    __table_args__ = (
+        # get_locations: WHERE is_active
+        Index(
+            "idx_locations_active",
+            "id",
+            postgresql_where=is_active.is_(True),
+            sqlite_where=is_active.is_(True)
+        ),
+    )
+
 
 # =====================================================
 # EVENT
 # =====================================================
-from sqlalchemy import Column, Integer, String, Text, Date, Boolean, TIMESTAMP
+from sqlalchemy import Column, Integer, String, Text, Date, Boolean, TIMESTAMP, Index, CheckConstraint
 from sqlalchemy.sql import func
 from .database import Base
 
@@ -319,3 +336,21 @@ class Event(Base):
         server_default=func.now(),
         onupdate=func.now()
     )
+
+    # status is derived from these dates at query time (see routers/event.py)
+    __table_args__ = (
+        CheckConstraint("end_date >= start_date", name="valid_date_range"),
+        Index(
+            "idx_events_active_dates",
+            "start_date",
+            "end_date",
+            postgresql_where=is_active.is_(True),
+            sqlite_where=is_active.is_(True)
+        ),
+        Index(
+            "idx_events_active_end_date",
+            "end_date",
+            postgresql_where=is_active.is_(True),
+            sqlite_where=is_active.is_(True)
+        ),
+    )
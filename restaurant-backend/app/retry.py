@@ -0,0 +1,70 @@
+import random
+import time
+
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from sqlalchemy.orm import Session
+
+from .metrics import metrics
+
+# ======================================================
+# TRANSIENT ERRORS
+# ======================================================
+# serialization_failure, deadlock_detected
+RETRYABLE_SQLSTATES = {"40001", "40P01"}
+
+MAX_ATTEMPTS = 3
+BASE_DELAY_SECONDS = 0.02
+MAX_DELAY_SECONDS = 0.25
+
+
+def is_transient(exc: DBAPIError, retry_constraints=()) -> bool:
+    orig = getattr(exc, "orig", None)
+    sqlstate = getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None)
+
+    if sqlstate in RETRYABLE_SQLSTATES:
+        return True
+
+    if isinstance(exc, IntegrityError) and retry_constraints:
+        diag = getattr(orig, "diag", None)
+        constraint = getattr(diag, "constraint_name", None)
+        if constraint:
+            return constraint in retry_constraints
+        return any(name in str(orig) for name in retry_constraints)
+
+    return False
+
+
+# ======================================================
+# TRANSACTION WITH RETRY
+# ======================================================
+def run_in_transaction(
+    db: Session,
+    work,
+    *,
+    name: str,
+    attempts: int = MAX_ATTEMPTS,
+    retry_constraints=(),
+):
+    """
+    Run `work(db)` inside `db.begin()`, retrying transient failures.
+
+    Serialization failures and deadlocks are always retried; integrity
+    errors only when they hit one of `retry_constraints`. Backoff is
+    exponential with full jitter, capped at MAX_DELAY_SECONDS. Anything
+    else (including HTTPException raised by `work`) rolls back and
+    propagates untouched, as does the last failed attempt.
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            with db.begin():
+                return work(db)
+        except DBAPIError as exc:
+            if not is_transient(exc, retry_constraints):
+                raise
+            if attempt == attempts:
+                metrics.inc(f"tx_retry_exhausted.{name}")
+                raise
+
+            metrics.inc(f"tx_retry.{name}")
+            delay = min(MAX_DELAY_SECONDS, BASE_DELAY_SECONDS * 2 ** (attempt - 1))
+            time.sleep(random.uniform(0, delay))
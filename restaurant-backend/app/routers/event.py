@@ -1,31 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import select, case, and_
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date
 from fastapi import UploadFile, File
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app import models, schemas
 from app.deps.admin import admin_guard
+from app.cache import event_cache, cached_json_response
 router = APIRouter(prefix="/events", tags=["Events"])
-import uuid
-from supabase import create_client
-import os
-
-# Pastikan URL berakhir dengan slash jika library memintanya
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-if SUPABASE_URL and not SUPABASE_URL.endswith("/"):
-    SUPABASE_URL += "/"
-SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
-
-def get_supabase():
-    if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
-        raise HTTPException(status_code=500, detail="Supabase not configured")
-    return create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
-
-ALLOWED_EXTENSIONS = {"jpg", "jpeg", "png", "webp"}
-ALLOWED_MIME = {"image/jpeg", "image/png", "image/webp"}
-MAX_FILE_SIZE = 2 * 1024 * 1024
-BUCKET = "menu-images"  # 🔥 samakan
-
+from app.storage import get_storage
+from app.uploads import store_image
 
 
 # ======================================================
@@ -36,50 +21,11 @@ BUCKET = "menu-images"  # 🔥 samakan
     dependencies=[Depends(admin_guard)],
     status_code=201
 )
-async def upload_event_image(file: UploadFile = File(...)):
-    if file.content_type not in ALLOWED_MIME:
-        raise HTTPException(status_code=400, detail="Invalid image type")
-
-    if not file.filename or "." not in file.filename:
-        raise HTTPException(status_code=400, detail="Invalid filename")
-
-    ext = file.filename.rsplit(".", 1)[-1].lower()
-    if ext not in ALLOWED_EXTENSIONS:
-        raise HTTPException(status_code=400, detail="Invalid file extension")
-
-    size = 0
-    chunks = []
-
-    while chunk := await file.read(1024 * 1024):
-        size += len(chunk)
-        if size > MAX_FILE_SIZE:
-            raise HTTPException(status_code=400, detail="File too large")
-        chunks.append(chunk)
-
-    content = b"".join(chunks)
-    filename = f"{uuid.uuid4()}.{ext}"
-
-    supabase = get_supabase()
-
-    res = supabase.storage.from_(BUCKET).upload(
-        filename,
-        content,
-        {
-            "content-type": file.content_type,
-            "cache-control": "31536000",
-            "upsert": False
-        }
-    )
-
-    if not res:
-        raise HTTPException(500, "Upload failed")
-
-    public_url = supabase.storage.from_(BUCKET).get_public_url(filename)
-
-    return {
-        "url": public_url   # 🔥 SAMAKAN DENGAN LOCATION
-    }
-
+async def upload_event_image(
+    file: UploadFile = File(...),
+    storage=Depends(get_storage)
+):
+    return await store_image(file, storage)
 
 
 def resolve_status(start_date: date, end_date: date) -> str:
@@ -93,33 +39,84 @@ def resolve_status(start_date: date, end_date: date) -> str:
 # ======================================================
 # READ
 # ======================================================
-@router.get("/", response_model=list[schemas.EventResponse])
-def get_events(
-    db: Session = Depends(get_db)
-):
+# status is derived from the dates at query time; the stored column is
+# only as fresh as the last write. These predicates are plain ranges so
+# they can use idx_events_active_dates / idx_events_active_end_date.
+def status_filter(status: str, today: date):
+    if status == "upcoming":
+        return models.Event.start_date > today
+    if status == "ongoing":
+        return and_(
+            models.Event.start_date <= today,
+            models.Event.end_date >= today
+        )
+    return models.Event.end_date < today
+
+
+def status_expr(today: date):
+    return case(
+        (models.Event.start_date > today, "upcoming"),
+        (models.Event.end_date >= today, "ongoing"),
+        else_="past"
+    ).label("current_status")
+
+
+_cache_day = None
+
+
+def _today() -> date:
+    # cached snapshots carry yesterday's statuses -> drop them at rollover
+    global _cache_day
+    today = date.today()
+    if _cache_day is not None and today != _cache_day:
+        event_cache._drop()
+    _cache_day = today
+    return today
+
+
+def events_query(today: date, *filters):
     return (
-        db.query(models.Event)
-        .filter(models.Event.is_active.is_(True))
+        select(models.Event, status_expr(today))
+        .where(models.Event.is_active.is_(True), *filters)
         .order_by(models.Event.start_date.asc())
-        .all()
+    )
+
+
+async def _load_events(db: AsyncSession, today: date, *filters):
+    result = await db.execute(events_query(today, *filters))
+    return [
+        schemas.EventResponse.model_validate(event).model_copy(
+            update={"status": current_status}
+        )
+        for event, current_status in result.all()
+    ]
+
+
+@router.get("/", response_model=list[schemas.EventResponse])
+async def get_events(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
+):
+    today = _today()
+    return await cached_json_response(
+        request, event_cache, ("all", today), lambda: _load_events(db, today)
     )
 
 @router.get("/filter", response_model=list[schemas.EventResponse])
-def get_events_by_status(
+async def get_events_by_status(
     status: str,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
 ):
     if status not in {"upcoming", "ongoing", "past"}:
         raise HTTPException(400, "Invalid status")
 
-    return (
-        db.query(models.Event)
-        .filter(
-            models.Event.is_active.is_(True),
-            models.Event.status == status
-        )
-        .order_by(models.Event.start_date.asc())
-        .all()
+    today = _today()
+    return await cached_json_response(
+        request,
+        event_cache,
+        ("status", status, today),
+        lambda: _load_events(db, today, status_filter(status, today))
     )
 
 # ======================================================
@@ -159,6 +156,7 @@ def create_event(
     db.add(db_event)
     db.commit()
     db.refresh(db_event)
+    event_cache.invalidate()
     return db_event
 
 
@@ -203,6 +201,7 @@ def update_event(
 
     db.commit()
     db.refresh(db_event)
+    event_cache.invalidate()
     return db_event
 
 # ======================================================
@@ -225,6 +224,7 @@ def delete_event(
 
     db_event.is_active = False
     db.commit()
+    event_cache.invalidate()
     return {"status": "deleted"}
 
 @router.get("/admin/check")
@@ -1,28 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Query
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app import models, schemas
 from app.deps.admin import admin_guard
+from app.cache import location_cache, cached_json_response
+from app.geo import NearestIndex, haversine_km
 from fastapi import UploadFile, File
-import uuid
-from supabase import create_client
-import os
-
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
-
-def get_supabase():
-    if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
-        raise HTTPException(status_code=500, detail="Supabase not configured")
-    return create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
-
-ALLOWED_EXTENSIONS = {"jpg", "jpeg", "png", "webp"}
-ALLOWED_MIME = {"image/jpeg", "image/png", "image/webp"}
-MAX_FILE_SIZE = 2 * 1024 * 1024
-BUCKET = "menu-images"  # 🔥 samakan
-
-
+from app.storage import get_storage
+from app.uploads import store_image
 
 
 router = APIRouter(prefix="/locations", tags=["Locations"])
@@ -36,58 +24,64 @@ router = APIRouter(prefix="/locations", tags=["Locations"])
     dependencies=[Depends(admin_guard)],
     status_code=201
 )
-async def upload_location_image(file: UploadFile = File(...)):
-    if file.content_type not in ALLOWED_MIME:
-        raise HTTPException(status_code=400, detail="Invalid image type")
-
-    if not file.filename or "." not in file.filename:
-        raise HTTPException(status_code=400, detail="Invalid filename")
-
-    ext = file.filename.rsplit(".", 1)[-1].lower()
-    if ext not in ALLOWED_EXTENSIONS:
-        raise HTTPException(status_code=400, detail="Invalid file extension")
-
-    size = 0
-    chunks = []
-
-    while chunk := await file.read(1024 * 1024):
-        size += len(chunk)
-        if size > MAX_FILE_SIZE:
-            raise HTTPException(status_code=400, detail="File too large")
-        chunks.append(chunk)
-
-    content = b"".join(chunks)
-    filename = f"{uuid.uuid4()}.{ext}"
-
-    supabase = get_supabase()
-
-    res = supabase.storage.from_(BUCKET).upload(
-        filename,
-        content,
-        {
-            "content-type": file.content_type,
-            "cache-control": "31536000",
-            "upsert": False
-        }
-    )
-    if not res:
-        raise HTTPException(500, "Upload failed")
-
-    return {
-        "url": supabase.storage.from_(BUCKET).get_public_url(filename)
-    }
-
+async def upload_location_image(
+    file: UploadFile = File(...),
+    storage=Depends(get_storage)
+):
+    return await store_image(file, storage)
 
 
 # ======================================================
 # READ ALL
 # ======================================================
+def locations_query():
+    return select(models.Location).where(models.Location.is_active.is_(True))
+
+
+async def _load_locations(db: AsyncSession):
+    result = await db.execute(locations_query())
+    locations = result.scalars().all()
+    return [
+        schemas.LocationOut.model_validate(loc, from_attributes=True)
+        for loc in locations
+    ]
+
+
 @router.get("/", response_model=list[schemas.LocationOut])
-def get_locations(db: Session = Depends(get_db)):
-    return db.query(models.Location).filter(
-        models.Location.is_active.is_(True)
-    ).all()
+async def get_locations(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await cached_json_response(
+        request, location_cache, "active", lambda: _load_locations(db)
+    )
+
 
+# ======================================================
+# NEAREST BRANCHES
+# ======================================================
+async def _load_nearest_index(db: AsyncSession):
+    return NearestIndex(await _load_locations(db))
+
+
+@router.get("/nearby", response_model=list[schemas.LocationNearby])
+async def get_nearby_locations(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    limit: int = Query(5, ge=1, le=50),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # rebuilt with the location snapshot, i.e. after every admin write
+    index = await location_cache.get_or_load(
+        "nearest_index", lambda: _load_nearest_index(db)
+    )
+    return [
+        schemas.LocationNearby(
+            **loc.model_dump(exclude={"image_variants"}),
+            distance_km=round(haversine_km(lat, lng, loc.lat, loc.lng), 3)
+        )
+        for loc in index.nearest(lat, lng, limit)
+    ]
 
 
 # ======================================================
@@ -102,6 +96,7 @@ def create_location(
     db.add(db_location)
     db.commit()
     db.refresh(db_location)
+    location_cache.invalidate()
     return db_location
 
 
@@ -126,6 +121,7 @@ def update_location(
 
     db.commit()
     db.refresh(db_location)
+    location_cache.invalidate()
     return db_location
 
 
@@ -147,6 +143,7 @@ def delete_location(
 
     db_location.is_active = False
     db.commit()
+    location_cache.invalidate()
     return {"status": "deleted"}
 
 @router.get("/admin/check")
@@ -1,45 +1,20 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db, get_async_db
 from app import models, schemas
-import uuid
-import os
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from supabase import create_client
+from app.cache import menu_cache, cached_json_response
+from fastapi import APIRouter, UploadFile, File, HTTPException, Request, Query
 from app.deps.admin import admin_guard
+from app.storage import get_storage
+from app.uploads import store_image
+from app.images import image_variants
+from app.search import MenuSearchIndex
 from fastapi import Depends
 from fastapi import status
 
 router = APIRouter(prefix="/menu", tags=["Menu"])
 
-# ======================================================
-# SUPABASE CONFIG (NO FALLBACK!)
-# ======================================================
-from supabase import create_client
-import os
-
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
-
-def get_supabase():
-    if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
-        raise HTTPException(
-            status_code=500,
-            detail="Supabase env not configured"
-        )
-
-    return create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
-
-
-
-
-ALLOWED_EXTENSIONS = {"jpg", "jpeg", "png", "webp"}
-ALLOWED_MIME = {
-    "image/jpeg",
-    "image/png",
-    "image/webp"
-}
-MAX_FILE_SIZE = 2 * 1024 * 1024  # 2MB
-BUCKET = "menu-images"
 
 
 # ======================================================
@@ -51,54 +26,12 @@ BUCKET = "menu-images"
     status_code=status.HTTP_201_CREATED
 )
 
-async def upload_image(file: UploadFile = File(...)):
-    print("SUPABASE_URL =", SUPABASE_URL)
-    print("SUPABASE_SERVICE_KEY =", SUPABASE_SERVICE_KEY[:10])
-
-    if file.content_type not in ALLOWED_MIME:
-        raise HTTPException(status_code=400, detail="Invalid image type")
-
-    size = 0
-    chunks = []
-
-    while chunk := await file.read(1024 * 1024):
-        size += len(chunk)
-        if size > MAX_FILE_SIZE:
-            raise HTTPException(status_code=400, detail="File too large")
-        chunks.append(chunk)
-
-    content = b"".join(chunks)
-    original_name = file.filename
-    if not file.filename or "." not in file.filename:
-        raise HTTPException(status_code=400, detail="Invalid filename")
-
-    ext = file.filename.rsplit(".", 1)[-1].lower()
-
-    if ext not in ALLOWED_EXTENSIONS:
-        raise HTTPException(status_code=400, detail="Invalid file extension")
-
-    filename = f"{uuid.uuid4()}.{ext}"
-
-    supabase = get_supabase()
-
-    try:
-        supabase.storage.from_(BUCKET).upload(
-            filename,
-            content,
-            {
-                "content-type": file.content_type,
-                "cache-control": "3600",
-                "upsert": False
-            }
-        )
-    except Exception:
-        raise HTTPException(
-            status_code=500,
-            detail="Failed to upload image"
-        )
+async def upload_image(
+    file: UploadFile = File(...),
+    storage=Depends(get_storage)
+):
+    return await store_image(file, storage)
 
-    public_url = supabase.storage.from_(BUCKET).get_public_url(filename)
-    return {"url": public_url}
 
 
 # ======================================================
@@ -106,16 +39,19 @@ async def upload_image(file: UploadFile = File(...)):
 # ======================================================
 from sqlalchemy.orm import joinedload
 
-@router.get("/")
-def get_menu(db: Session = Depends(get_db)):
-    items = (
-        db.query(models.MenuItem)
+def menu_query():
+    return (
+        select(models.MenuItem)
         .options(joinedload(models.MenuItem.category))
-        .filter(models.MenuItem.is_active.is_(True))
+        .where(models.MenuItem.is_active.is_(True))
         .order_by(models.MenuItem.id.asc())
-        .all()
     )
 
+
+async def _load_menu(db: AsyncSession):
+    result = await db.execute(menu_query())
+    items = result.scalars().all()
+
     result = {}
     for item in items:
         cat = item.category.name if item.category else "Uncategorized"
@@ -124,12 +60,40 @@ def get_menu(db: Session = Depends(get_db)):
             "title": item.title,
             "desc": item.description,
             "price": item.price,
-            "image": item.image_url
+            "image": item.image_url,
+            "image_variants": image_variants(item.image_url)
         })
 
     return result
 
 
+@router.get("/")
+async def get_menu(request: Request, db: AsyncSession = Depends(get_async_db)):
+    return await cached_json_response(
+        request, menu_cache, "grouped", lambda: _load_menu(db)
+    )
+
+
+# ======================================================
+# SEARCH
+# ======================================================
+async def _load_search_index(db: AsyncSession):
+    return MenuSearchIndex(await _load_menu(db))
+
+
+@router.get("/search")
+async def search_menu(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # rebuilt with the menu snapshot, i.e. after every menu mutation
+    index = await menu_cache.get_or_load(
+        "search_index", lambda: _load_search_index(db)
+    )
+    return index.search(q, limit)
+
+
 
 # ======================================================
 # CREATE
@@ -149,6 +113,7 @@ def create_menu(
         db.add(category)
         db.commit()
         db.refresh(category)
+        menu_cache.invalidate()
 
     item = models.MenuItem(
         title=menu.title,
@@ -161,6 +126,7 @@ def create_menu(
     db.add(item)
     db.commit()
     db.refresh(item)
+    menu_cache.invalidate()
 
     return {"status": "created", "id": item.id}
 
@@ -190,6 +156,7 @@ def update_menu(
             db.add(category)
             db.commit()
             db.refresh(category)
+            menu_cache.invalidate()
         item.category_id = category.id
 
     if menu.title is not None:
@@ -202,6 +169,7 @@ def update_menu(
         item.image_url = menu.image_url
 
     db.commit()
+    menu_cache.invalidate()
     return {"status": "updated"}
 
 
@@ -222,6 +190,7 @@ def delete_menu(menu_id: int, db: Session = Depends(get_db)):
 
     # 3. Commit the change to the database
     db.commit()
+    menu_cache.invalidate()
 
     return {"status": "deleted", "message": "Item is now inactive"}
 
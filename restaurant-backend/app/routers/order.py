@@ -1,11 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, Header, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select, update, delete, literal, case
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from datetime import datetime, timezone, timedelta
 from uuid import UUID
 
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.models import Order, OrderItem, MenuItem
+from app.schemas import CartUpdate
+from app.retry import run_in_transaction
 
 router = APIRouter(prefix="/orders", tags=["Orders"])
 
@@ -61,6 +65,79 @@ def get_or_create_draft(
     }
 
 
+# =====================================================
+# CART MUTATIONS (ONE STATEMENT PER CLICK)
+# =====================================================
+def _active_draft(order_id: int, visitor_token: UUID, now: datetime):
+    return (
+        Order.id == order_id,
+        Order.visitor_token == visitor_token,
+        Order.status == "draft",
+        Order.expires_at > now,
+    )
+
+
+def _upsert_item(db: Session, order_id, visitor_token, menu_item_id, delta, now):
+    """
+    INSERT ... SELECT ... ON CONFLICT (order_id, menu_item_id) DO UPDATE.
+
+    The SELECT only yields a row when the draft is still active and the
+    menu item is on sale, so ownership is checked in the same statement.
+    Returns the new quantity, or None when nothing matched.
+    """
+    source = (
+        select(Order.id, MenuItem.id, literal(delta))
+        .join(
+            MenuItem,
+            (MenuItem.id == menu_item_id) & MenuItem.is_active.is_(True)
+        )
+        .where(*_active_draft(order_id, visitor_token, now))
+    )
+
+    stmt = pg_insert(OrderItem).from_select(
+        ["order_id", "menu_item_id", "quantity"], source
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[OrderItem.order_id, OrderItem.menu_item_id],
+        set_={"quantity": OrderItem.quantity + stmt.excluded.quantity}
+    ).returning(OrderItem.quantity)
+
+    return db.execute(stmt).scalar()
+
+
+def _adjust_item(db: Session, order_id, visitor_token, menu_item_id, delta, now):
+    """
+    Change the quantity of an existing cart line by `delta`.
+
+    A guarded UPDATE ... RETURNING does the common case in one statement;
+    only when it matches nothing (line missing, or it would drop to zero
+    or below) a guarded DELETE follows. Returns the new quantity (0 when
+    deleted), or None when the line/draft doesn't exist.
+    """
+    # IN (subquery) rather than a joined UPDATE/DELETE: works on SQLite too
+    owned = (
+        OrderItem.order_id.in_(
+            select(Order.id).where(*_active_draft(order_id, visitor_token, now))
+        ),
+        OrderItem.menu_item_id == menu_item_id,
+    )
+
+    quantity = db.execute(
+        update(OrderItem)
+        .where(*owned, OrderItem.quantity + delta > 0)
+        .values(quantity=OrderItem.quantity + delta)
+        .returning(OrderItem.quantity)
+    ).scalar()
+    if quantity is not None:
+        return quantity
+
+    return db.execute(
+        delete(OrderItem)
+        .where(*owned, OrderItem.quantity + delta <= 0)
+        .returning(literal(0))
+    ).scalar()
+
+
 # =====================================================
 # ADD ITEM TO DRAFT
 # =====================================================
@@ -73,87 +150,98 @@ def add_to_draft(
 ):
     now = datetime.now(timezone.utc)
 
-    with db.begin():
-        order = (
-            db.query(Order)
-            .filter(
-                Order.id == order_id,
-                Order.visitor_token == visitor_token,
-                Order.status == "draft",
-                Order.expires_at > now
-            )
-            .with_for_update()
-            .first()
-        )
+    quantity = run_in_transaction(
+        db,
+        lambda db: _upsert_item(db, order_id, visitor_token, menu_item_id, 1, now),
+        name="cart_add"
+    )
 
-        if not order:
-            raise HTTPException(404, "Draft order not found or expired")
+    if quantity is None:
+        raise HTTPException(404, "Draft order or menu item not found")
 
-        menu_item = db.query(MenuItem).filter(
-            MenuItem.id == menu_item_id,
-            MenuItem.is_active.is_(True)
-        ).first()
+    return {"status": "added"}
 
-        if not menu_item:
-            raise HTTPException(404, "Menu item not found")
 
-        item = (
-            db.query(OrderItem)
-            .filter_by(order_id=order.id, menu_item_id=menu_item_id)
-            .with_for_update()
-            .first()
+# =====================================================
+# GET ORDER (SECURED)
+# =====================================================
+def _order_view_stmt(*filters):
+    """
+    One round trip for the whole cart: the order header plus only the
+    menu columns the cart needs, outer-joined so an empty cart still
+    yields its header row.
+    """
+    return (
+        select(
+            Order.id,
+            Order.status,
+            Order.expires_at,
+            OrderItem.menu_item_id,
+            MenuItem.title,
+            MenuItem.price,
+            OrderItem.quantity,
         )
+        .select_from(Order)
+        .outerjoin(OrderItem, OrderItem.order_id == Order.id)
+        .outerjoin(MenuItem, MenuItem.id == OrderItem.menu_item_id)
+        .where(*filters)
+        .order_by(OrderItem.id)
+    )
 
-        if item:
-            item.quantity += 1
-        else:
-            db.add(OrderItem(
-                order_id=order.id,
-                menu_item_id=menu_item_id,
-                quantity=1
-            ))
 
-    return {"status": "added"}
+def _order_view(rows):
+    if not rows:
+        return None
+
+    items = []
+    total = 0
+    for row in rows:
+        if row.menu_item_id is None:
+            continue
+        subtotal = row.price * row.quantity
+        total += subtotal
+        items.append({
+            "menu_item_id": row.menu_item_id,
+            "title": row.title,
+            "price": row.price,
+            "quantity": row.quantity,
+            "subtotal": subtotal
+        })
+
+    head = rows[0]
+    return {
+        "id": head.id,
+        "status": head.status,
+        "expires_at": head.expires_at,
+        "items": items,
+        "total": total
+    }
 
 
-# =====================================================
-# GET ORDER (SECURED)
-# =====================================================
 @router.get("/{order_id}")
-def get_order(
+async def get_order(
     order_id: int,
     visitor_token: UUID = Header(..., alias="X-Visitor-Token"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     now = datetime.now(timezone.utc)
 
-    order = db.query(Order).filter(
-        Order.id == order_id,
-        Order.visitor_token == visitor_token,
-        Order.expires_at > now
-    ).first()
+    result = await db.execute(
+        _order_view_stmt(
+            Order.id == order_id,
+            Order.visitor_token == visitor_token,
+            Order.expires_at > now
+        )
+    )
+    order = _order_view(result.all())
 
     if not order:
         raise HTTPException(404, "Order not found")
 
-    if order.status != "draft":
+    if order["status"] != "draft":
         raise HTTPException(403, "Order already confirmed")
 
-    return {
-        "id": order.id,
-        "status": order.status,
-        "expires_at": order.expires_at,
-        "items": [
-            {
-                "menu_item_id": item.menu_item_id,
-                "title": item.menu_item.title,
-                "price": item.menu_item.price,
-                "quantity": item.quantity,
-                "subtotal": item.menu_item.price * item.quantity
-            }
-            for item in order.items
-        ]
-    }
+    return order
 
 
 @router.post("/{order_id}/confirm")
@@ -192,25 +280,14 @@ def increase_qty(
 ):
     now = datetime.now(timezone.utc)
 
-    with db.begin():
-        item = (
-            db.query(OrderItem)
-            .join(Order)
-            .filter(
-                Order.id == order_id,
-                Order.visitor_token == visitor_token,
-                Order.status == "draft",
-                Order.expires_at > now,
-                OrderItem.menu_item_id == menu_item_id
-            )
-            .with_for_update()
-            .first()
-        )
-
-        if not item:
-            raise HTTPException(404, "Item not found or order locked")
+    quantity = run_in_transaction(
+        db,
+        lambda db: _adjust_item(db, order_id, visitor_token, menu_item_id, 1, now),
+        name="cart_inc"
+    )
 
-        item.quantity += 1
+    if quantity is None:
+        raise HTTPException(404, "Item not found or order locked")
 
     return {"status": "ok"}
 
@@ -224,27 +301,132 @@ def decrease_qty(
 ):
     now = datetime.now(timezone.utc)
 
-    with db.begin():
-        item = (
-            db.query(OrderItem)
-            .join(Order)
-            .filter(
-                Order.id == order_id,
-                Order.visitor_token == visitor_token,
-                Order.status == "draft",
-                Order.expires_at > now,
-                OrderItem.menu_item_id == menu_item_id
+    quantity = run_in_transaction(
+        db,
+        lambda db: _adjust_item(db, order_id, visitor_token, menu_item_id, -1, now),
+        name="cart_dec"
+    )
+
+    if quantity is None:
+        raise HTTPException(404, "Item not found or order locked")
+
+    return {"status": "ok"}
+
+
+# =====================================================
+# BATCH CART UPDATE
+# =====================================================
+@router.patch("/{order_id}/items")
+def update_items(
+    order_id: int,
+    changes: CartUpdate,
+    visitor_token: UUID = Header(..., alias="X-Visitor-Token"),
+    db: Session = Depends(get_db)
+):
+    now = datetime.now(timezone.utc)
+
+    # later entries for the same menu item win (absolute) / add up (delta)
+    requested = {}
+    for change in changes.items:
+        if changes.mode == "absolute":
+            if change.quantity < 0:
+                raise HTTPException(400, "Quantity must not be negative")
+            requested[change.menu_item_id] = change.quantity
+        else:
+            requested[change.menu_item_id] = (
+                requested.get(change.menu_item_id, 0) + change.quantity
             )
+
+    def apply(db: Session):
+        # one lock per batch so concurrent batches can't interleave deltas
+        order = (
+            db.query(Order)
+            .filter(*_active_draft(order_id, visitor_token, now))
             .with_for_update()
             .first()
         )
 
-        if not item:
-            raise HTTPException(404, "Item not found or order locked")
+        if not order:
+            raise HTTPException(404, "Draft order not found or expired")
 
-        if item.quantity <= 1:
-            db.delete(item)
-        else:
-            item.quantity -= 1
+        # the single-click paths don't take the order lock, so lock the
+        # lines themselves: an /inc on one of them waits for this batch
+        current = dict(
+            db.execute(
+                select(OrderItem.menu_item_id, OrderItem.quantity)
+                .where(
+                    OrderItem.order_id == order.id,
+                    OrderItem.menu_item_id.in_(requested)
+                )
+                .order_by(OrderItem.menu_item_id)
+                .with_for_update()
+            ).all()
+        )
 
-    return {"status": "ok"}
+        targets = {}
+        for menu_item_id, quantity in requested.items():
+            if changes.mode == "delta":
+                quantity += current.get(menu_item_id, 0)
+            targets[menu_item_id] = max(quantity, 0)
+
+        to_upsert = {
+            menu_item_id: quantity
+            for menu_item_id, quantity in targets.items()
+            if quantity > 0 and quantity != current.get(menu_item_id)
+        }
+        to_delete = [
+            menu_item_id
+            for menu_item_id, quantity in targets.items()
+            if quantity == 0 and menu_item_id in current
+        ]
+
+        if to_upsert:
+            active = set(
+                db.execute(
+                    select(MenuItem.id).where(
+                        MenuItem.id.in_(to_upsert),
+                        MenuItem.is_active.is_(True)
+                    )
+                ).scalars()
+            )
+            missing = sorted(set(to_upsert) - active)
+            if missing:
+                raise HTTPException(404, f"Menu item not found: {missing}")
+
+            stmt = pg_insert(OrderItem).values([
+                {
+                    "order_id": order.id,
+                    "menu_item_id": menu_item_id,
+                    "quantity": quantity
+                }
+                for menu_item_id, quantity in sorted(to_upsert.items())
+            ])
+            quantity = stmt.excluded.quantity
+            if changes.mode == "delta":
+                # a line that didn't exist when we read (so isn't locked)
+                # may have been added since: add to it, don't overwrite
+                quantity = case(
+                    (
+                        OrderItem.menu_item_id.not_in(current),
+                        OrderItem.quantity + stmt.excluded.quantity
+                    ),
+                    else_=stmt.excluded.quantity
+                )
+            db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[OrderItem.order_id, OrderItem.menu_item_id],
+                    set_={"quantity": quantity}
+                )
+            )
+
+        if to_delete:
+            db.execute(
+                delete(OrderItem).where(
+                    OrderItem.order_id == order.id,
+                    OrderItem.menu_item_id.in_(to_delete)
+                )
+            )
+
+    run_in_transaction(db, apply, name="cart_batch")
+
+    return _order_view(db.execute(_order_view_stmt(Order.id == order_id)).all())
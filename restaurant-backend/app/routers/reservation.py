@@ -1,11 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from datetime import datetime, timezone, date
 from typing import Optional, List
 
-from app.database import get_db
+from app.database import get_db, engine
 from app.deps.admin import admin_guard
 from app.models import (
     Reservation,
@@ -13,10 +14,37 @@ from app.models import (
     DailyQueueCounter
 )
 from app.schemas import ReservationCreate, ReservationOut
+from app.retry import run_in_transaction
 
 router = APIRouter(prefix="/reservations", tags=["Reservations"])
 
 
+# =====================================================
+# QUEUE NUMBER ALLOCATION
+# =====================================================
+def allocate_queue_number(queue_date: date) -> int:
+    """
+    Hand out the next queue number for `queue_date` in one upsert.
+
+    Runs on its own connection and commits straight away, so the
+    counter row is locked only for this single statement instead of
+    for the whole booking transaction. A booking that fails after
+    this point (e.g. its draft order expired) leaves a gap in the day's
+    numbers, never a duplicate.
+    """
+    stmt = pg_insert(DailyQueueCounter).values(
+        queue_date=queue_date,
+        last_number=1
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[DailyQueueCounter.queue_date],
+        set_={"last_number": DailyQueueCounter.last_number + 1}
+    ).returning(DailyQueueCounter.last_number)
+
+    with engine.begin() as conn:
+        return conn.execute(stmt).scalar_one()
+
+
 @router.post(
     "/",
     response_model=ReservationOut,
@@ -26,53 +54,38 @@ def create_reservation(
     data: ReservationCreate,
     db: Session = Depends(get_db)
 ):
-    now = datetime.now(timezone.utc)
-
-    # Optional draft order validation
-    order = None
-    if data.order_id:
-        order = (
-            db.query(Order)
-            .filter(
-                Order.id == data.order_id,
-                Order.status == "draft",
-                Order.expires_at > now
-            )
-            .with_for_update()
-            .first()
-        )
-
-        if not order:
-            raise HTTPException(
-                status.HTTP_404_NOT_FOUND,
-                "Active draft order not found or expired"
-            )
+    def book(db: Session):
+        # before the session's first query: the session only checks out
+        # its pooled connection then, so a booking never holds two at once
+        # (a burst bigger than the pool would otherwise deadlock on it)
+        queue_number = allocate_queue_number(data.reservation_date)
+        now = datetime.now(timezone.utc)
 
-        if order.reservation:
-            raise HTTPException(
-                status.HTTP_400_BAD_REQUEST,
-                "Order already has a reservation"
+        # Optional draft order validation
+        order = None
+        if data.order_id:
+            order = (
+                db.query(Order)
+                .filter(
+                    Order.id == data.order_id,
+                    Order.status == "draft",
+                    Order.expires_at > now
+                )
+                .with_for_update()
+                .first()
             )
 
-    try:
-        # 🔒 Lock daily counter row
-        counter = (
-            db.query(DailyQueueCounter)
-            .filter(DailyQueueCounter.queue_date == data.reservation_date)
-            .with_for_update()
-            .first()
-        )
-
-        if not counter:
-            counter = DailyQueueCounter(
-                queue_date=data.reservation_date,
-                last_number=0
-            )
-            db.add(counter)
-            db.flush()  # ensure row exists before increment
+            if not order:
+                raise HTTPException(
+                    status.HTTP_404_NOT_FOUND,
+                    "Active draft order not found or expired"
+                )
 
-        counter.last_number += 1
-        queue_number = counter.last_number
+            if order.reservation:
+                raise HTTPException(
+                    status.HTTP_400_BAD_REQUEST,
+                    "Order already has a reservation"
+                )
 
         reservation = Reservation(
             order_id=data.order_id,
@@ -91,19 +104,43 @@ def create_reservation(
         if order:
             order.status = "confirmed"
 
-        db.commit()
-        db.refresh(reservation)
         return reservation
 
+    try:
+        reservation = run_in_transaction(
+            db,
+            book,
+            name="reservation_create",
+            retry_constraints=("uq_reservations_daily_queue",)
+        )
     except IntegrityError:
-        db.rollback()
         raise HTTPException(
             status.HTTP_409_CONFLICT,
             "Failed to create reservation, please retry"
         )
 
-from sqlalchemy.orm import joinedload
-from app.models import OrderItem
+    db.refresh(reservation)
+    return reservation
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import selectinload, noload
+from app.models import OrderItem, MenuItem
+
+
+# =====================================================
+# KEYSET CURSOR (reservation_date DESC, queue_number ASC)
+# =====================================================
+def encode_cursor(reservation: Reservation) -> str:
+    return f"{reservation.reservation_date.isoformat()}_{reservation.queue_number}"
+
+
+def decode_cursor(cursor: str):
+    try:
+        day, queue_number = cursor.split("_", 1)
+        return date.fromisoformat(day), int(queue_number)
+    except ValueError:
+        raise HTTPException(400, "Invalid cursor")
+
 
 @router.get(
     "/",
@@ -111,19 +148,28 @@ from app.models import OrderItem
     dependencies=[Depends(admin_guard)]
 )
 def list_reservations(
+    response: Response,
     reservation_date: Optional[date] = None,
     location_id: Optional[int] = None,
     status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(200, ge=1, le=1000),
+    include_items: bool = True,
     db: Session = Depends(get_db)
 ):
-    query = (
-        db.query(Reservation)
-        .options(
-            joinedload(Reservation.order)
-            .joinedload(Order.items)
+    query = db.query(Reservation)
+
+    if include_items:
+        # selectin keeps one row per reservation instead of multiplying
+        # reservation x items; only the title is needed from menu_items
+        query = query.options(
+            selectinload(Reservation.order)
+            .selectinload(Order.items)
             .joinedload(OrderItem.menu_item)
+            .load_only(MenuItem.title)
         )
-    )
+    else:
+        query = query.options(noload(Reservation.order))
 
     if reservation_date:
         query = query.filter(Reservation.reservation_date == reservation_date)
@@ -134,15 +180,37 @@ def list_reservations(
     if status:
         query = query.filter(Reservation.status == status)
 
-    return (
+    if cursor:
+        last_date, last_queue = decode_cursor(cursor)
+        query = query.filter(
+            # redundant, but a bare OR can't be an index condition; this
+            # lets the scan start at last_date instead of the newest row
+            Reservation.reservation_date <= last_date,
+            or_(
+                Reservation.reservation_date < last_date,
+                and_(
+                    Reservation.reservation_date == last_date,
+                    Reservation.queue_number > last_queue
+                )
+            )
+        )
+
+    rows = (
         query
         .order_by(
             Reservation.reservation_date.desc(),
             Reservation.queue_number.asc()
         )
+        .limit(limit + 1)
         .all()
     )
 
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(rows[-1])
+
+    return rows
+
 
 @router.patch(
     "/{reservation_id}/status",
@@ -178,6 +246,132 @@ def update_reservation_status(
 
     return reservation
 
+# =====================================================
+# EXPORT (STREAMING NDJSON / CSV)
+# =====================================================
+import csv
+import io
+import orjson
+from typing import Literal
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func
+from app.models import Location
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _export_stmt(date_from, date_to, location_id, status):
+    order_total = (
+        select(func.coalesce(func.sum(MenuItem.price * OrderItem.quantity), 0))
+        .select_from(OrderItem)
+        .join(MenuItem, MenuItem.id == OrderItem.menu_item_id)
+        .where(OrderItem.order_id == Reservation.order_id)
+        .scalar_subquery()
+    )
+    item_count = (
+        select(func.coalesce(func.sum(OrderItem.quantity), 0))
+        .where(OrderItem.order_id == Reservation.order_id)
+        .scalar_subquery()
+    )
+
+    stmt = (
+        select(
+            Reservation.id,
+            Reservation.reservation_date,
+            Reservation.reservation_time,
+            Reservation.queue_number,
+            Reservation.status,
+            Reservation.customer_name,
+            Reservation.phone,
+            Reservation.pax,
+            Reservation.location_id,
+            Location.name.label("location_name"),
+            Reservation.order_id,
+            item_count.label("item_count"),
+            order_total.label("order_total"),
+            Reservation.created_at,
+        )
+        .select_from(Reservation)
+        .join(Location, Location.id == Reservation.location_id)
+        .order_by(Reservation.reservation_date, Reservation.queue_number)
+    )
+
+    if date_from:
+        stmt = stmt.where(Reservation.reservation_date >= date_from)
+    if date_to:
+        stmt = stmt.where(Reservation.reservation_date <= date_to)
+    if location_id:
+        stmt = stmt.where(Reservation.location_id == location_id)
+    if status:
+        stmt = stmt.where(Reservation.status == status)
+
+    return stmt
+
+
+def _json_default(value):
+    # orjson covers date/time/datetime/UUID; this catches e.g. Decimal
+    return str(value)
+
+
+def _stream_rows(stmt, fmt: str):
+    # server-side cursor: rows come over in EXPORT_BATCH_SIZE chunks and
+    # each chunk is written out before the next one is fetched
+    with engine.connect() as conn:
+        result = conn.execution_options(yield_per=EXPORT_BATCH_SIZE).execute(stmt)
+        columns = list(result.keys())
+
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+
+        for rows in result.partitions():
+            if fmt == "csv":
+                writer.writerows(rows)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            else:
+                yield b"".join(
+                    orjson.dumps(
+                        dict(zip(columns, row)),
+                        default=_json_default,
+                        option=orjson.OPT_APPEND_NEWLINE
+                    )
+                    for row in rows
+                )
+
+        if fmt == "csv" and buffer.tell():
+            yield buffer.getvalue()
+
+
+@router.get("/export", dependencies=[Depends(admin_guard)])
+def export_reservations(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    location_id: Optional[int] = None,
+    status: Optional[str] = None,
+):
+    if date_from and date_to and date_to < date_from:
+        raise HTTPException(400, "date_to must not be before date_from")
+
+    stmt = _export_stmt(date_from, date_to, location_id, status)
+    filename = "reservations_{}_{}.{}".format(
+        date_from or "start", date_to or "end", format
+    )
+
+    return StreamingResponse(
+        _stream_rows(stmt, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
 @router.get("/admin/check")
 def admin_check(dep=Depends(admin_guard)):
     return {"ok": True}
\ No newline at end of file
@@ -1,9 +1,11 @@
 #COPAS
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from pydantic import BaseModel, Field, computed_field
+from typing import Optional, List, Literal
 from datetime import datetime, date
 from uuid import UUID
 from pydantic import BaseModel, HttpUrl
+
+from . import images
 from datetime import date
 from typing import Optional
 
@@ -51,6 +53,11 @@ class EventResponse(BaseModel):
     is_active: bool
     is_featured: bool
 
+    @computed_field
+    @property
+    def cover_variants(self) -> Optional[dict[str, str]]:
+        return images.image_variants(self.cover_image)
+
     class Config:
         from_attributes = True
 
@@ -85,6 +92,14 @@ class LocationOut(LocationBase):
     rating: Optional[float]
     reviews: int
 
+    @computed_field
+    @property
+    def image_variants(self) -> Optional[dict[str, str]]:
+        return images.image_variants(self.image_url)
+
+class LocationNearby(LocationOut):
+    distance_km: float
+
 class LocationUpdate(BaseModel):
     name: Optional[str]
     phone_number: Optional[str]
@@ -157,6 +172,15 @@ class OrderOut(BaseModel):
     class Config:
         from_attributes = True
 
+class CartItemChange(BaseModel):
+    menu_item_id: int = Field(..., gt=0)
+    quantity: int
+
+
+class CartUpdate(BaseModel):
+    mode: Literal["delta", "absolute"] = "delta"
+    items: List[CartItemChange] = Field(..., min_length=1, max_length=100)
+
 # schemas/order.py
 class OrderItemSummary(BaseModel):
     title: str
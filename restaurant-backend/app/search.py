@@ -0,0 +1,203 @@
+import re
+import unicodedata
+
+# ======================================================
+# TOKENIZER (INDONESIAN-AWARE)
+# ======================================================
+_WORD = re.compile(r"[a-z0-9]+")
+
+# informal spellings that show up on menus and in searches
+CANONICAL = {
+    "mie": "mi",
+    "sup": "sop",
+    "telor": "telur",
+}
+
+# particles / possessives first, then derivational suffixes
+SUFFIXES = ("nya", "lah", "kah", "kan", "an")
+MIN_STEM = 3
+
+
+def _fold(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text.lower())
+    return "".join(ch for ch in text if not unicodedata.combining(ch))
+
+
+def stem(token: str) -> str:
+    """
+    Light suffix stripping: gorengan -> goreng, manisnya -> manis.
+
+    Prefixes (me-, ber-, ke-, se-, ter-...) are left alone: too many dish
+    names start with them (kerupuk, serundeng, terong, bebek).
+    """
+    for suffix in SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= MIN_STEM:
+            return token[:-len(suffix)]
+    return token
+
+
+def tokenize(text: str | None) -> list[str]:
+    tokens = []
+    for token in _WORD.findall(_fold(text or "")):
+        # kue2 / ayam2 -> reduplication written with a 2
+        if len(token) > 2 and token.endswith("2") and token[-2].isalpha():
+            token = token[:-1]
+        token = CANONICAL.get(token, token)
+        # sayur-sayuran -> one "sayur", not two
+        if tokens and stem(tokens[-1]) == stem(token):
+            continue
+        tokens.append(token)
+    return tokens
+
+
+def _trigrams(term: str) -> set[str]:
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _is_abbreviation(query: str, term: str) -> bool:
+    # bbk -> bebek, grg -> goreng: same initial, letters in order
+    if len(query) < 3 or query[0] != term[0] or len(query) >= len(term):
+        return False
+    it = iter(term)
+    return all(ch in it for ch in query)
+
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    # optimal string alignment (counts a swap as one edit), early exit
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            cur[j] = min(
+                prev[j] + 1,
+                cur[j - 1] + 1,
+                prev[j - 1] + (ca != cb)
+            )
+            if (i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb):
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+def _typo_budget(token: str) -> int:
+    if len(token) >= 8:
+        return 2
+    if len(token) >= 4:
+        return 1
+    return 0
+
+
+# ======================================================
+# INVERTED INDEX
+# ======================================================
+TITLE_WEIGHT = 3.0
+CATEGORY_WEIGHT = 1.5
+DESCRIPTION_WEIGHT = 1.0
+
+EXACT = 1.0
+STEM = 0.9
+PREFIX = 0.8
+ABBREVIATION = 0.6
+TYPO = 0.5
+
+
+class MenuSearchIndex:
+    """
+    In-memory inverted index over the grouped menu snapshot.
+
+    Every query token must match each result somewhere (title, category
+    or description), exactly, as a stem, as a prefix, as a consonant
+    abbreviation (bbk -> bebek) or within a small edit distance.
+    """
+
+    def __init__(self, grouped_menu: dict):
+        self.items = {}
+        self.postings = {}       # term -> {item_id: field weight}
+        self.by_initial = {}     # first letter -> [terms]
+        self.trigrams = {}       # trigram -> {terms}
+
+        for category, items in grouped_menu.items():
+            for item in items:
+                self.items[item["id"]] = {**item, "category": category}
+                self._add(item["id"], item["title"], TITLE_WEIGHT)
+                self._add(item["id"], category, CATEGORY_WEIGHT)
+                self._add(item["id"], item.get("desc"), DESCRIPTION_WEIGHT)
+
+        for term in self.postings:
+            self.by_initial.setdefault(term[0], []).append(term)
+            for gram in _trigrams(term):
+                self.trigrams.setdefault(gram, set()).add(term)
+
+    def _add(self, item_id, text, weight):
+        for token in tokenize(text):
+            for term in {token, stem(token)}:
+                postings = self.postings.setdefault(term, {})
+                postings[item_id] = max(postings.get(item_id, 0), weight)
+
+    def _expand(self, token: str) -> dict[str, float]:
+        """Vocabulary terms a query token can stand for, with match quality."""
+        matches = {}
+
+        def offer(term, quality):
+            if quality > matches.get(term, 0):
+                matches[term] = quality
+
+        if token in self.postings:
+            offer(token, EXACT)
+        if stem(token) in self.postings:
+            offer(stem(token), STEM)
+
+        if len(token) >= 2:
+            for term in self.by_initial.get(token[0], ()):
+                if term.startswith(token):
+                    offer(term, PREFIX)
+                elif _is_abbreviation(token, term):
+                    offer(term, ABBREVIATION)
+
+        budget = _typo_budget(token)
+        if budget:
+            candidates = set()
+            for gram in _trigrams(token):
+                candidates |= self.trigrams.get(gram, set())
+            for term in candidates:
+                if term not in matches and _edit_distance(token, term, budget) <= budget:
+                    offer(term, TYPO)
+
+        return matches
+
+    def search(self, query: str, limit: int = 20) -> list[dict]:
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        scores = None
+        for token in tokens:
+            token_scores = {}
+            for term, quality in self._expand(token).items():
+                for item_id, weight in self.postings[term].items():
+                    score = quality * weight
+                    if score > token_scores.get(item_id, 0):
+                        token_scores[item_id] = score
+
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {
+                    item_id: score + token_scores[item_id]
+                    for item_id, score in scores.items()
+                    if item_id in token_scores
+                }
+            if not scores:
+                return []
+
+        ranked = sorted(
+            scores.items(),
+            key=lambda pair: (-pair[1], self.items[pair[0]]["title"])
+        )
+        return [self.items[item_id] for item_id, _ in ranked[:limit]]
@@ -0,0 +1,104 @@
+import re
+import stat
+from mimetypes import guess_type
+
+import anyio
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse
+
+# ======================================================
+# CACHE POLICY
+# ======================================================
+# style.3f2a9c1b0d.css -> content changes always change the name
+FINGERPRINTED = re.compile(r"\.[0-9a-f]{10}\.\w+$")
+
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+ASSET_CACHE = "public, max-age=86400"
+HTML_CACHE = "no-cache"
+
+COMPRESSIBLE = (".html", ".css", ".js", ".json", ".svg", ".txt")
+
+# preferred first
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+
+def _accepted_encodings(header: str) -> set[str]:
+    accepted = set()
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        if coding:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def cache_control_for(path: str) -> str:
+    if FINGERPRINTED.search(path):
+        return IMMUTABLE_CACHE
+    if path == "." or path.endswith(".html"):
+        return HTML_CACHE
+    return ASSET_CACHE
+
+
+# ======================================================
+# STATIC FILES WITH .br / .gz SIBLINGS
+# ======================================================
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles that serves `<file>.br` / `<file>.gz` built ahead of time
+    by `python -m app.build_static`, picked from Accept-Encoding.
+
+    Conditional requests and Range are handled by FileResponse as usual;
+    every response also gets a Cache-Control matching cache_control_for().
+    """
+
+    async def get_response(self, path: str, scope) -> FileResponse:
+        response = None
+        if scope["method"] in ("GET", "HEAD"):
+            response = await self._precompressed_response(path, scope)
+        if response is None:
+            response = await super().get_response(path, scope)
+
+        response.headers["Cache-Control"] = cache_control_for(path)
+        if path == "." or path.endswith(COMPRESSIBLE):
+            response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+    async def _precompressed_response(self, path: str, scope):
+        request_headers = Headers(scope=scope)
+        accepted = _accepted_encodings(request_headers.get("accept-encoding", ""))
+        if not accepted:
+            return None
+
+        # StaticFiles normalises "/" to "."; other directories go through
+        # the parent class so its trailing-slash redirect still applies
+        target = "index.html" if path == "." else path
+        if not target.endswith(COMPRESSIBLE):
+            return None
+
+        media_type = guess_type(target)[0] or "text/plain"
+
+        for encoding, suffix in PRECOMPRESSED:
+            if encoding not in accepted:
+                continue
+
+            full_path, stat_result = await anyio.to_thread.run_sync(
+                self.lookup_path, target + suffix
+            )
+            if not stat_result or not stat.S_ISREG(stat_result.st_mode):
+                continue
+
+            response = FileResponse(
+                full_path,
+                stat_result=stat_result,
+                media_type=media_type,
+                headers={"Content-Encoding": encoding}
+            )
+            if self.is_not_modified(response.headers, request_headers):
+                return NotModifiedResponse(response.headers)
+            return response
+
+        return None
@@ -0,0 +1,116 @@
+import os
+from pathlib import Path
+
+from fastapi import HTTPException, Request
+from supabase import create_client
+
+# ======================================================
+# CONFIG
+# ======================================================
+BUCKET = "menu-images"
+
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+if SUPABASE_URL and not SUPABASE_URL.endswith("/"):
+    SUPABASE_URL += "/"
+SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
+
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "supabase")  # "supabase" | "local"
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+LOCAL_STORAGE_DIR = Path(
+    os.getenv("LOCAL_STORAGE_DIR", BASE_DIR / "assets" / "uploads")
+)
+LOCAL_STORAGE_URL = os.getenv(
+    "LOCAL_STORAGE_URL", "http://127.0.0.1:8000/assets/uploads"
+)
+
+
+# ======================================================
+# SUPABASE STORAGE
+# ======================================================
+class SupabaseStorage:
+    """
+    One Supabase client for the whole app.
+
+    The storage sub-client keeps a single httpx session, so uploads reuse
+    pooled keep-alive connections instead of a new TLS handshake each.
+    """
+
+    def __init__(self, url: str, key: str, bucket: str = BUCKET):
+        self._client = create_client(url, key)
+        self._bucket = self._client.storage.from_(bucket)
+
+    def upload(self, path: str, content: bytes, content_type: str,
+               cache_control: str = "31536000", upsert: bool = False):
+        self._bucket.upload(
+            path,
+            content,
+            {
+                "content-type": content_type,
+                "cache-control": cache_control,
+                "upsert": "true" if upsert else False
+            }
+        )
+
+    def exists(self, path: str) -> bool:
+        return self._bucket.exists(path)
+
+    def public_url(self, path: str) -> str:
+        return self._bucket.get_public_url(path)
+
+    def close(self):
+        self._client.storage.session.close()
+
+
+# ======================================================
+# LOCAL STORAGE (OFFLINE / TESTS)
+# ======================================================
+class LocalStorage:
+    """Fake bucket on the local filesystem, same interface as Supabase."""
+
+    def __init__(self, root: Path = LOCAL_STORAGE_DIR,
+                 base_url: str = LOCAL_STORAGE_URL):
+        self.root = Path(root)
+        self.base_url = base_url.rstrip("/")
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def upload(self, path: str, content: bytes, content_type: str,
+               cache_control: str = "31536000", upsert: bool = False):
+        target = self.root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # "x" mirrors upsert=false: fail if the object already exists
+        with open(target, "wb" if upsert else "xb") as f:
+            f.write(content)
+
+    def exists(self, path: str) -> bool:
+        return (self.root / path).is_file()
+
+    def public_url(self, path: str) -> str:
+        return f"{self.base_url}/{path}"
+
+    def close(self):
+        pass
+
+
+# ======================================================
+# LIFESPAN FACTORY + DEPENDENCY
+# ======================================================
+def create_storage():
+    if STORAGE_BACKEND == "local":
+        return LocalStorage()
+
+    if STORAGE_BACKEND != "supabase":
+        raise RuntimeError("STORAGE_BACKEND must be 'supabase' or 'local'")
+
+    # uploads answer 500 until configured, the rest of the API still runs
+    if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
+        return None
+
+    return SupabaseStorage(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+
+
+def get_storage(request: Request):
+    storage = getattr(request.app.state, "storage", None)
+    if storage is None:
+        raise HTTPException(status_code=500, detail="Storage not configured")
+    return storage
@@ -0,0 +1,79 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timezone
+
+from sqlalchemy import select, delete
+
+from .database import engine
+from .metrics import metrics
+from .models import Order
+
+logger = logging.getLogger(__name__)
+
+# ======================================================
+# CONFIG
+# ======================================================
+SWEEP_INTERVAL_SECONDS = int(os.getenv("DRAFT_SWEEP_INTERVAL_SECONDS", "300"))
+SWEEP_BATCH_SIZE = int(os.getenv("DRAFT_SWEEP_BATCH_SIZE", "500"))
+SWEEP_MAX_BATCHES = int(os.getenv("DRAFT_SWEEP_MAX_BATCHES", "20"))
+
+
+# ======================================================
+# SWEEP (ONE RUN)
+# ======================================================
+def sweep_expired_drafts(now: datetime | None = None) -> int:
+    """
+    Delete expired draft orders in bounded batches.
+
+    Each batch is its own short transaction walking idx_orders_expires
+    oldest-first; order_items go with them via ON DELETE CASCADE.
+    SKIP LOCKED lets several workers sweep at once without blocking
+    each other or a visitor still touching their cart.
+    """
+    now = now or datetime.now(timezone.utc)
+    purged = 0
+
+    for _ in range(SWEEP_MAX_BATCHES):
+        expired = (
+            select(Order.id)
+            .where(Order.status == "draft", Order.expires_at < now)
+            .order_by(Order.expires_at)
+            .limit(SWEEP_BATCH_SIZE)
+        )
+        if engine.dialect.name == "postgresql":
+            expired = expired.with_for_update(skip_locked=True)
+
+        with engine.begin() as conn:
+            deleted = conn.execute(
+                delete(Order).where(Order.id.in_(expired.scalar_subquery()))
+            ).rowcount
+
+        purged += deleted
+        if deleted < SWEEP_BATCH_SIZE:
+            break
+
+    metrics.inc("draft_sweeper_runs")
+    metrics.inc("draft_sweeper_purged_total", purged)
+    metrics.set("draft_sweeper_last_purged", purged)
+    metrics.set("draft_sweeper_last_run_at", now.isoformat())
+    return purged
+
+
+# ======================================================
+# BACKGROUND LOOP (STARTED FROM LIFESPAN)
+# ======================================================
+async def run_draft_sweeper(stop: asyncio.Event):
+    while not stop.is_set():
+        try:
+            purged = await asyncio.to_thread(sweep_expired_drafts)
+            if purged:
+                logger.info("Purged %d expired draft orders", purged)
+        except Exception:
+            metrics.inc("draft_sweeper_errors")
+            logger.exception("Draft order sweep failed")
+
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=SWEEP_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
@@ -0,0 +1,194 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException, UploadFile
+from PIL import Image
+
+from .metrics import metrics
+from .images import (
+    make_variants,
+    read_width,
+    variant_widths,
+    original_path,
+    variant_path,
+    image_variants,
+    image_srcset,
+)
+
+# ======================================================
+# IMAGE RULES (SHARED BY MENU / EVENTS / LOCATIONS)
+# ======================================================
+ALLOWED_EXTENSIONS = {"jpg", "jpeg", "png", "webp"}
+ALLOWED_MIME = {
+    "image/jpeg",
+    "image/png",
+    "image/webp"
+}
+MAX_FILE_SIZE = 2 * 1024 * 1024  # 2MB
+CHUNK_SIZE = 256 * 1024
+
+# uploads bigger than this go to a temp file instead of staying in RAM
+SPOOL_MAX_MEMORY = 256 * 1024
+
+
+def sniff_image(head: bytes):
+    """(ext, content_type) from the file's magic bytes, or None."""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpg", "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png", "image/png"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp", "image/webp"
+    return None
+
+# objects are keyed by content hash, so they never change
+CACHE_CONTROL = "31536000"
+
+# ======================================================
+# CONCURRENCY
+# ======================================================
+MAX_CONCURRENT_UPLOADS = int(os.getenv("MAX_CONCURRENT_UPLOADS", "4"))
+
+# storage calls are blocking HTTP -> run them here, never on the loop
+_upload_executor = ThreadPoolExecutor(
+    max_workers=MAX_CONCURRENT_UPLOADS,
+    thread_name_prefix="upload"
+)
+_upload_slots = asyncio.Semaphore(MAX_CONCURRENT_UPLOADS)
+
+
+async def _read_image(file: UploadFile):
+    """
+    Stream the upload into a spooled temp file in one pass.
+
+    The real type comes from the magic bytes of the first chunk (the
+    declared MIME/extension are only a first filter), the size cap is
+    enforced as chunks arrive and the content hash is built on the way.
+    Caller owns (and must close) the returned spool.
+    """
+    if file.content_type not in ALLOWED_MIME:
+        raise HTTPException(status_code=400, detail="Invalid image type")
+
+    if not file.filename or "." not in file.filename:
+        raise HTTPException(status_code=400, detail="Invalid filename")
+
+    ext = file.filename.rsplit(".", 1)[-1].lower()
+    if ext not in ALLOWED_EXTENSIONS:
+        raise HTTPException(status_code=400, detail="Invalid file extension")
+
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    try:
+        size = 0
+        sniffed = None
+        digest = hashlib.sha256()
+
+        while chunk := await file.read(CHUNK_SIZE):
+            if sniffed is None:
+                sniffed = sniff_image(chunk)
+                if sniffed is None:
+                    raise HTTPException(status_code=400, detail="Invalid image")
+
+            size += len(chunk)
+            if size > MAX_FILE_SIZE:
+                raise HTTPException(status_code=400, detail="File too large")
+
+            digest.update(chunk)
+            spool.write(chunk)
+
+        if sniffed is None:
+            raise HTTPException(status_code=400, detail="Empty file")
+
+        spool.seek(0)
+        ext, content_type = sniffed
+        return spool, ext, content_type, digest.hexdigest()
+    except BaseException:
+        spool.close()
+        raise
+
+
+def _store_all(storage, key, ext, original, content_type, variants):
+    # same key == same bytes, so overwriting is harmless; the original
+    # goes last and marks the set as complete for the dedup check
+    for name, data in variants.items():
+        storage.upload(
+            variant_path(key, name), data, "image/webp", CACHE_CONTROL,
+            upsert=True
+        )
+    storage.upload(
+        original_path(key, ext), original, content_type, CACHE_CONTROL,
+        upsert=True
+    )
+
+
+async def store_image(file: UploadFile, storage) -> dict:
+    """
+    Validate an uploaded image, re-encode it (clean original + WebP
+    variants) and push everything to storage, all off the event loop.
+
+    Objects are keyed by the SHA-256 of the upload, hashed while it
+    streams in; when that key is already stored the upload is skipped
+    entirely and the existing URLs are returned.
+
+    The raw upload stays in the spool (on disk past SPOOL_MAX_MEMORY)
+    and only Pillow reads it. What sits in memory per upload is the
+    decoded image (up to MAX_IMAGE_PIXELS) plus the re-encoded original
+    and variants as bytes, which storage receives. At most
+    MAX_CONCURRENT_UPLOADS run per worker; further uploads wait for a
+    slot, which bounds that to a few uploads at once.
+    """
+    async with _upload_slots:
+        spool, ext, content_type, key = await _read_image(file)
+        path = original_path(key, ext)
+
+        with spool:
+            loop = asyncio.get_running_loop()
+            try:
+                exists = await loop.run_in_executor(
+                    _upload_executor, storage.exists, path
+                )
+            except Exception:
+                exists = False  # fall back to a normal upload
+
+            try:
+                if exists:
+                    metrics.inc("upload_dedup_hits")
+                    width = await loop.run_in_executor(
+                        _upload_executor, read_width, spool
+                    )
+                else:
+                    original, variants, width = await loop.run_in_executor(
+                        _upload_executor, make_variants, spool, ext
+                    )
+            except Image.DecompressionBombError:
+                raise HTTPException(status_code=400, detail="Image too large")
+            except OSError:  # includes PIL.UnidentifiedImageError
+                raise HTTPException(status_code=400, detail="Invalid image")
+
+            if not exists:
+                try:
+                    await loop.run_in_executor(
+                        _upload_executor,
+                        _store_all,
+                        storage,
+                        key,
+                        ext,
+                        original,
+                        content_type,
+                        variants
+                    )
+                except Exception:
+                    raise HTTPException(
+                        status_code=500,
+                        detail="Failed to upload image"
+                    )
+
+        url = storage.public_url(path)
+        variant_urls = image_variants(url)
+        return {
+            "url": url,
+            "variants": variant_urls,
+            "srcset": image_srcset(variant_urls, variant_widths(width))
+        }
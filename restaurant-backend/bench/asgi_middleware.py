@@ -0,0 +1,111 @@
+"""
+Requests/sec through the security-headers middleware: the old
+BaseHTTPMiddleware version vs. the pure ASGI one in app.main.
+
+    python bench/asgi_middleware.py [--requests 5000] [--concurrency 50]
+
+Runs in-process over httpx.ASGITransport, no server and no database:
+/menu/ goes through cached_json_response with a stubbed loader, so it
+measures the cached catalog path the real endpoint serves.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("ENV", "production")
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{tempfile.gettempdir()}/bench_unused.db"
+)
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.cache import CatalogCache, cached_json_response
+from app.main import SecurityHeadersMiddleware
+
+
+class BaseHTTPSecurityHeaders(BaseHTTPMiddleware):
+    # the implementation SecurityHeadersMiddleware replaced
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        for key, value in SecurityHeadersMiddleware.HEADERS.items():
+            response.headers[key] = value
+        return response
+
+
+MENU = {
+    category: [
+        {
+            "id": i,
+            "title": f"{category} {i}",
+            "desc": "Bebek goreng kremes dengan sambal korek",
+            "price": 30000 + i,
+            "image": None,
+            "image_variants": None,
+        }
+        for i in range(50)
+    ]
+    for category in ("main", "side", "snack", "beverage")
+}
+
+
+def build(middleware) -> FastAPI:
+    api = FastAPI(default_response_class=ORJSONResponse)
+    api.add_middleware(middleware)
+    cache = CatalogCache(f"bench_{middleware.__name__}")
+
+    async def load_menu():
+        return MENU
+
+    @api.get("/health")
+    def health():
+        return {"status": "ok"}
+
+    @api.get("/menu/")
+    async def menu(request: Request):
+        return await cached_json_response(request, cache, "grouped", load_menu)
+
+    return api
+
+
+async def measure(api, path, requests, concurrency):
+    transport = httpx.ASGITransport(app=api)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.get(path)
+        assert response.headers["X-Frame-Options"] == "DENY"
+
+        async def worker(count):
+            for _ in range(count):
+                await client.get(path)
+
+        per_worker = requests // concurrency
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(per_worker) for _ in range(concurrency)))
+        return per_worker * concurrency / (time.perf_counter() - started)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    apps = {
+        "BaseHTTPMiddleware": build(BaseHTTPSecurityHeaders),
+        "pure ASGI": build(SecurityHeadersMiddleware),
+    }
+    for path in ("/health", "/menu/"):
+        for label, api in apps.items():
+            rps = await measure(api, path, args.requests, args.concurrency)
+            print(f"{path:8} {label:20} {rps:8.0f} req/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
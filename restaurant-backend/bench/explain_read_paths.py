@@ -0,0 +1,164 @@
+"""
+Index usage check: EXPLAIN the public read queries and assert each one
+goes through the index built for it.
+
+    DATABASE_URL=postgresql://... python bench/explain_read_paths.py \
+        [--rows 20000]
+
+The statements come from the routers themselves (menu_query,
+locations_query, events_query + status_filter), compiled for Postgres,
+so a change to a filter that stops matching a partial index predicate
+fails here. Runs against a migrated database: --rows synthetic rows
+per table (10% active) are inserted and ANALYZEd inside a transaction
+that is rolled back, with enable_seqscan off so the check is about
+whether the index *can* serve the predicate, not about table size.
+
+Exits 1 when any query misses its index. Needs Postgres.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+from datetime import date, datetime, timezone
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("ENV", "production")
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{tempfile.gettempdir()}/bench_unused.db"
+)
+
+from sqlalchemy import create_engine, select, text
+
+from app.models import Order
+from app.routers.event import events_query, status_filter
+from app.routers.location import locations_query
+from app.routers.menu import menu_query
+
+FIXTURE = [
+    "INSERT INTO menu_categories (name) VALUES (:category)",
+    "INSERT INTO menu_items (category_id, title, price, is_active) "
+    "SELECT (SELECT id FROM menu_categories WHERE name = :category), "
+    "'item ' || g, 10000, g % 10 = 0 "
+    "FROM generate_series(1, :rows) AS g",
+    "INSERT INTO locations (name, lat, lng, address, is_active) "
+    "SELECT 'branch ' || g, -6.2, 106.8, 'address', g % 10 = 0 "
+    "FROM generate_series(1, :rows) AS g",
+    # mostly future events, a few running / finished
+    "INSERT INTO events (title, start_date, end_date, is_active) "
+    "SELECT 'event ' || g, CURRENT_DATE + (g % 1000) - 20, "
+    "CURRENT_DATE + (g % 1000) - 20 + g % 5, g % 10 = 0 "
+    "FROM generate_series(1, :rows) AS g",
+    "INSERT INTO orders (visitor_token, status, expires_at) "
+    "SELECT md5(random()::text || g)::uuid, "
+    "(ARRAY['draft', 'confirmed', 'cancelled'])[g % 3 + 1], "
+    "now() + (g % 7 - 3) * interval '1 hour' "
+    "FROM generate_series(1, :rows) AS g",
+    "ANALYZE menu_items, locations, events, orders",
+]
+
+# draft lookup: one row per token, UNIQUE (visitor_token) covers it
+# (uq_active_visitor_token on baseline schemas, ix_ on create_all ones)
+DRAFT_INDEXES = {
+    "orders_visitor_token_key",
+    "uq_active_visitor_token",
+    "ix_orders_visitor_token",
+}
+
+# both event indexes are partial on is_active; when the date filter
+# keeps most active rows the planner bitmap-scans either one and sorts
+ACTIVE_EVENT_INDEXES = {"idx_events_active_dates", "idx_events_active_end_date"}
+
+
+def read_paths(today: date, now: datetime):
+    """(label, statement, indexes that may serve it)"""
+    return [
+        ("get_menu", menu_query(), {"idx_menu_items_active"}),
+        ("get_locations", locations_query(), {"idx_locations_active"}),
+        ("get_events", events_query(today), ACTIVE_EVENT_INDEXES),
+        (
+            "events/filter upcoming",
+            events_query(today, status_filter("upcoming", today)),
+            ACTIVE_EVENT_INDEXES,
+        ),
+        (
+            "events/filter ongoing",
+            events_query(today, status_filter("ongoing", today)),
+            {"idx_events_active_dates"},
+        ),
+        (
+            "events/filter past",
+            events_query(today, status_filter("past", today)),
+            {"idx_events_active_end_date"},
+        ),
+        (
+            "get_or_create_draft",
+            # same filters as routers/order.py
+            select(Order).where(
+                Order.visitor_token == uuid4(),
+                Order.status == "draft",
+                Order.expires_at > now
+            ),
+            DRAFT_INDEXES,
+        ),
+    ]
+
+
+def index_names(plan) -> set[str]:
+    names = set()
+    if "Index Name" in plan:
+        names.add(plan["Index Name"])
+    for child in plan.get("Plans", ()):
+        names |= index_names(child)
+    return names
+
+
+def explain(conn, statement) -> set[str]:
+    sql = statement.compile(
+        dialect=conn.dialect, compile_kwargs={"literal_binds": True}
+    )
+    rows = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar()
+    if isinstance(rows, str):
+        rows = json.loads(rows)
+    return index_names(rows[0]["Plan"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    args = parser.parse_args()
+
+    engine = create_engine(os.environ["DATABASE_URL"])
+    if engine.dialect.name != "postgresql":
+        sys.exit("explain_read_paths needs a Postgres DATABASE_URL")
+
+    failures = 0
+    with engine.connect() as conn:
+        trans = conn.begin()
+        try:
+            params = {"rows": args.rows, "category": f"explain-{uuid4()}"}
+            for statement in FIXTURE:
+                conn.execute(text(statement), params)
+            conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+
+            today = date.today()
+            now = datetime.now(timezone.utc)
+            for label, statement, expected in read_paths(today, now):
+                used = explain(conn, statement)
+                ok = bool(used & expected)
+                failures += not ok
+                print(
+                    f"{'ok' if ok else 'MISS':4} {label:24} "
+                    f"uses {sorted(used) or 'no index'}, "
+                    f"expected one of {sorted(expected)}"
+                )
+        finally:
+            trans.rollback()
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Booking burst: queue numbers under a row lock vs. a one-statement upsert.
+
+    DATABASE_URL=postgresql://... python bench/reservation_burst.py \
+        [--bookings 400] [--threads 32] [--work-ms 20]
+
+"before" is the old create_reservation: SELECT ... FOR UPDATE on the
+day's daily_queue_counters row, then the rest of the booking (simulated
+with pg_sleep(--work-ms)) in the same transaction, so every booking for
+that day waits for the one ahead of it.
+"after" is allocate_queue_number: the upsert commits on its own, then
+the booking transaction runs without holding the counter row.
+
+Only a far-future counter row is touched and it is deleted afterwards.
+Needs Postgres (ON CONFLICT ... RETURNING, row locks).
+"""
+import argparse
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from sqlalchemy import create_engine, text
+
+BENCH_DATE = date(2999, 12, 31)
+
+LOCKED_SELECT = text(
+    "SELECT last_number FROM daily_queue_counters "
+    "WHERE queue_date = :d FOR UPDATE"
+)
+LOCKED_UPDATE = text(
+    "UPDATE daily_queue_counters SET last_number = last_number + 1 "
+    "WHERE queue_date = :d RETURNING last_number"
+)
+UPSERT = text(
+    "INSERT INTO daily_queue_counters (queue_date, last_number) "
+    "VALUES (:d, 1) "
+    "ON CONFLICT (queue_date) DO UPDATE "
+    "SET last_number = daily_queue_counters.last_number + 1 "
+    "RETURNING last_number"
+)
+BOOKING_WORK = text("SELECT pg_sleep(:s)")
+
+
+def book_before(engine, work):
+    with engine.begin() as conn:
+        conn.execute(LOCKED_SELECT, {"d": BENCH_DATE})
+        number = conn.execute(LOCKED_UPDATE, {"d": BENCH_DATE}).scalar_one()
+        conn.execute(BOOKING_WORK, {"s": work})
+    return number
+
+
+def book_after(engine, work):
+    with engine.begin() as conn:
+        number = conn.execute(UPSERT, {"d": BENCH_DATE}).scalar_one()
+    with engine.begin() as conn:
+        conn.execute(BOOKING_WORK, {"s": work})
+    return number
+
+
+def run(engine, book, bookings, threads, work):
+    with engine.begin() as conn:
+        conn.execute(
+            text("DELETE FROM daily_queue_counters WHERE queue_date = :d"),
+            {"d": BENCH_DATE}
+        )
+        conn.execute(
+            text("INSERT INTO daily_queue_counters VALUES (:d, 0)"),
+            {"d": BENCH_DATE}
+        )
+
+    latencies = []
+
+    def one(_):
+        started = time.perf_counter()
+        number = book(engine, work)
+        latencies.append(time.perf_counter() - started)
+        return number
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        numbers = list(pool.map(one, range(bookings)))
+    elapsed = time.perf_counter() - started
+
+    assert sorted(numbers) == list(range(1, bookings + 1)), "duplicate queue numbers"
+    latencies.sort()
+    return {
+        "bookings/s": round(bookings / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bookings", type=int, default=400)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--work-ms", type=float, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine(
+        os.environ["DATABASE_URL"],
+        pool_size=args.threads,
+        max_overflow=args.threads
+    )
+    work = args.work_ms / 1000
+
+    try:
+        for label, book in (("before", book_before), ("after", book_after)):
+            print(label, run(engine, book, args.bookings, args.threads, work))
+    finally:
+        with engine.begin() as conn:
+            conn.execute(
+                text("DELETE FROM daily_queue_counters WHERE queue_date = :d"),
+                {"d": BENCH_DATE}
+            )
+
+
+if __name__ == "__main__":
+    main()
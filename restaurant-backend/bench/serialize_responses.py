@@ -0,0 +1,150 @@
+"""
+JSON response cost on the real FastAPI paths: the default JSONResponse
+vs. ORJSONResponse (app.main's default_response_class).
+
+    python bench/serialize_responses.py [--requests 200] [--rows 200]
+
+list_reservations is a response_model route. FastAPI validates and
+serializes its rows with pydantic either way, and the response class
+only renders the result, so the whole request is timed through
+TestClient against a throwaway SQLite file, next to the render step
+alone. get_menu returns the cached catalog Response: its JSON is
+rendered once per cache fill (app.cache._render), not per request, so
+that fill is timed separately on a 200-item menu.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import timeit
+from datetime import date, time as dtime, timedelta
+from pathlib import Path
+
+DB_PATH = Path(tempfile.gettempdir()) / "bench_serialize.db"
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("ENV", "production")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ.setdefault("ADMIN_API_KEY", "bench")
+
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.testclient import TestClient
+
+from app import models
+from app.cache import _render
+from app.database import Base, SessionLocal, engine
+from app.routers import reservation
+
+HEADERS = {"X-API-Key": os.environ["ADMIN_API_KEY"]}
+
+
+def seed(rows: int):
+    DB_PATH.unlink(missing_ok=True)
+    Base.metadata.create_all(engine)
+
+    db = SessionLocal()
+    category = models.MenuCategory(name="main")
+    location = models.Location(name="Pusat", lat=-6.2, lng=106.8, address="Jl. Bebek")
+    items = [
+        models.MenuItem(category=category, title=f"Bebek Goreng {i}", price=30000)
+        for i in range(10)
+    ]
+    db.add_all([category, location, *items])
+    db.flush()
+
+    for i in range(rows):
+        order = models.Order(status="confirmed")
+        order.items = [
+            models.OrderItem(menu_item_id=items[(i + n) % 10].id, quantity=n + 1)
+            for n in range(3)
+        ]
+        db.add(models.Reservation(
+            order=order,
+            customer_name=f"Pelanggan {i}",
+            phone="08123456789",
+            pax=2 + i % 4,
+            reservation_date=date(2026, 10, 1) + timedelta(days=i % 30),
+            reservation_time=dtime(11 + i % 9, 30),
+            location_id=location.id,
+            queue_number=i // 30 + 1
+        ))
+    db.commit()
+    db.close()
+
+
+def build_menu(items: int = 200) -> dict:
+    # same shape as routers/menu.py _load_menu
+    menu = {}
+    for i in range(items):
+        category = ("Main", "Side", "Snack", "Beverage")[i % 4]
+        base = f"https://cdn.example.com/images/{i:064x}"
+        menu.setdefault(category, []).append({
+            "id": i,
+            "title": f"Bebek Goreng {i}",
+            "desc": "Bebek goreng kremes dengan sambal korek dan lalapan",
+            "price": 30000 + i * 500,
+            "image": f"{base}/original.jpg",
+            "image_variants": {
+                name: f"{base}/{name}.webp" for name in ("thumb", "card", "hero")
+            },
+        })
+    return menu
+
+
+def per_call_us(fn, number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=200)
+    args = parser.parse_args()
+
+    seed(args.rows)
+    url = f"/reservations/?limit={args.rows}"
+
+    bodies = {}
+    print(f"GET {url} ({args.rows} reservations x 3 items), per request:")
+    for cls in (JSONResponse, ORJSONResponse):
+        app = FastAPI(default_response_class=cls)
+        app.include_router(reservation.router)
+        with TestClient(app) as client:
+            bodies[cls] = client.get(url, headers=HEADERS).json()
+            best = per_call_us(
+                lambda: client.get(url, headers=HEADERS), args.requests // 5 or 1
+            )
+        print(f"  {cls.__name__:16} {best / 1000:8.2f} ms")
+
+    # same document either way
+    assert bodies[JSONResponse] == bodies[ORJSONResponse]
+    assert len(bodies[JSONResponse]) == args.rows
+
+    # the only step the response class changes: rendering the already
+    # serialized content
+    content = bodies[JSONResponse]
+    print("  of which render:")
+    for cls in (JSONResponse, ORJSONResponse):
+        best = per_call_us(lambda: cls(content), args.requests)
+        print(f"  {cls.__name__:16} {best / 1000:8.2f} ms")
+
+    menu = build_menu()
+    print("get_menu cache fill (200 items), once per cache version:")
+    fills = {
+        "json.dumps(jsonable_encoder)": lambda: json.dumps(
+            jsonable_encoder(menu), ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8"),
+        "cache._render (orjson+ETag)": lambda: _render(menu),
+    }
+    for label, fn in fills.items():
+        print(f"  {label:28} {per_call_us(fn, args.requests) / 1000:8.2f} ms")
+
+    engine.dispose()
+    DB_PATH.unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+-- migrate: no-transaction
+-- =====================================================
+-- READ PATH INDEXES
+-- =====================================================
+-- Partial indexes matching the public catalog reads, built without
+-- blocking writes.
+
+-- get_menu: WHERE is_active IS true ORDER BY id
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_menu_items_active
+ON menu_items (id)
+WHERE is_active IS true;
+
+-- get_locations: WHERE is_active IS true
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_locations_active
+ON locations (id)
+WHERE is_active IS true;
+
+-- get_events (ORDER BY start_date), /events/filter upcoming + ongoing
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_events_active_dates
+ON events (start_date, end_date)
+WHERE is_active IS true;
+
+-- /events/filter past
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_events_active_end_date
+ON events (end_date)
+WHERE is_active IS true;
@@ -0,0 +1,25 @@
+"""
+models.Event now declares valid_date_range; databases built with
+create_all never got it. Add it NOT VALID (no table scan under the
+ACCESS EXCLUSIVE lock), then VALIDATE, which only takes SHARE UPDATE
+EXCLUSIVE and lets reads and writes carry on.
+"""
+from sqlalchemy import text
+
+TRANSACTIONAL = False
+
+
+def upgrade(conn):
+    exists = conn.execute(text(
+        "SELECT 1 FROM pg_constraint "
+        "WHERE conname = 'valid_date_range' "
+        "AND conrelid = 'events'::regclass"
+    )).first()
+
+    if not exists:
+        conn.execute(text(
+            "ALTER TABLE events ADD CONSTRAINT valid_date_range "
+            "CHECK (end_date >= start_date) NOT VALID"
+        ))
+
+    conn.execute(text("ALTER TABLE events VALIDATE CONSTRAINT valid_date_range"))
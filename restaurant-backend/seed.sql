@@ -1,176 +1,3 @@
-
--- =====================================================
--- EVENTS
--- =====================================================
-CREATE TABLE events (
-    id SERIAL PRIMARY KEY,
-
-    title VARCHAR(150) NOT NULL,
-    description TEXT,
-
-    start_date DATE NOT NULL,
-    end_date DATE NOT NULL,
-
-    status VARCHAR(20) NOT NULL DEFAULT 'upcoming',
-
-    detail_link TEXT, -- nullable (frontend hides button if NULL)
-
-    cover_image TEXT, -- image path / URL
-
-    is_active BOOLEAN NOT NULL DEFAULT TRUE,
-    is_featured BOOLEAN NOT NULL DEFAULT FALSE,
-
-    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-
-    CONSTRAINT valid_date_range CHECK (end_date >= start_date)
-);
-
-
-
--- =====================================================
--- LOCATIONS
--- =====================================================
-CREATE TABLE locations (
-    id SERIAL PRIMARY KEY,
-    name TEXT NOT NULL,
-    phone_number TEXT,
-    lat DOUBLE PRECISION NOT NULL,
-    lng DOUBLE PRECISION NOT NULL,
-    address TEXT NOT NULL,
-    hours TEXT,
-    rating DOUBLE PRECISION CHECK (rating BETWEEN 0 AND 5),
-    reviews INTEGER DEFAULT 0,
-    image_url TEXT,
-    maps_url TEXT
-);
-ALTER TABLE locations
-ADD COLUMN is_active BOOLEAN NOT NULL DEFAULT true;
-
--- =====================================================
--- MENU CATEGORIES
--- =====================================================
-CREATE TABLE menu_categories (
-    id SERIAL PRIMARY KEY,
-    name TEXT NOT NULL UNIQUE
-);
-
--- =====================================================
--- MENU ITEMS
--- =====================================================
-CREATE TABLE menu_items (
-    id SERIAL PRIMARY KEY,
-    category_id INTEGER NOT NULL
-        REFERENCES menu_categories(id) ON DELETE RESTRICT,
-    title TEXT NOT NULL,
-    description TEXT,
-    price INTEGER NOT NULL CHECK (price > 0),
-    image_url TEXT,
-    is_active BOOLEAN NOT NULL DEFAULT TRUE
-);
-
-CREATE INDEX idx_menu_items_category
-ON menu_items(category_id);
-
--- =====================================================
--- ORDERS (VISITOR SESSION)
--- =====================================================
-CREATE TABLE orders (
-    id SERIAL PRIMARY KEY,
-    visitor_token UUID NOT NULL,
-    order_name TEXT DEFAULT 'Draft Order',
-    status TEXT NOT NULL DEFAULT 'draft'
-        CHECK (status IN ('draft', 'confirmed', 'cancelled')),
-    created_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
-    expires_at TIMESTAMPTZ NOT NULL,
-    UNIQUE (visitor_token)
-);
-
-CREATE INDEX idx_orders_expires
-ON orders(expires_at);
-
-CREATE INDEX idx_orders_status
-ON orders(status);
-
--- =====================================================
--- ORDER ITEMS
--- =====================================================
-CREATE TABLE order_items (
-    id SERIAL PRIMARY KEY,
-    order_id INTEGER NOT NULL
-        REFERENCES orders(id) ON DELETE CASCADE,
-    menu_item_id INTEGER NOT NULL
-        REFERENCES menu_items(id) ON DELETE RESTRICT,
-    quantity INTEGER NOT NULL DEFAULT 1 CHECK (quantity > 0),
-    UNIQUE (order_id, menu_item_id)
-);
-
-CREATE INDEX idx_order_items_order
-ON order_items(order_id);
-
--- =====================================================
--- DAILY QUEUE SEQUENCE (ANTI RACE CONDITION)
--- =====================================================
-CREATE TABLE daily_queue_counters (
-    queue_date DATE PRIMARY KEY,
-    last_number INTEGER NOT NULL DEFAULT 0
-);
-
--- =====================================================
--- RESERVATIONS
--- =====================================================
-CREATE TABLE reservations (
-    id SERIAL PRIMARY KEY,
-    order_id INTEGER NOT NULL
-        REFERENCES orders(id) ON DELETE CASCADE,
-    customer_name TEXT NOT NULL,
-    reservation_at TIMESTAMPTZ NOT NULL,
-
-    -- 🔥 FIX
-    reservation_date DATE NOT NULL,
-
-    queue_number INTEGER NOT NULL,
-    created_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
-);
-ALTER TABLE reservations
-ALTER COLUMN order_id DROP NOT NULL;
-
-ALTER TABLE reservations
-DROP COLUMN reservation_at;
-
-ALTER TABLE reservations
-ADD COLUMN reservation_time TIME NOT NULL;
-
-ALTER TABLE reservations
-ADD COLUMN pax INTEGER NOT NULL DEFAULT 1,
-ADD COLUMN location_id INTEGER NOT NULL REFERENCES locations(id),
-ADD COLUMN status TEXT NOT NULL DEFAULT 'pending',
-ADD COLUMN phone TEXT;
-
-ALTER TABLE reservations
-ADD CONSTRAINT chk_reservation_status
-CHECK (status IN ('pending', 'confirmed', 'cancelled'));
-
-CREATE INDEX idx_reservations_admin_view
-ON reservations (reservation_date, location_id, status);
-
-
-CREATE INDEX idx_reservations_date
-ON reservations (reservation_date);
-
-CREATE UNIQUE INDEX uq_reservations_daily_queue
-ON reservations (reservation_date, queue_number);
-
-
-CREATE UNIQUE INDEX uq_active_visitor_token
-ON orders(visitor_token)
-WHERE status = 'draft';
-
-CREATE UNIQUE INDEX uq_reservation_order
-ON reservations(order_id)
-WHERE order_id IS NOT NULL;
-
-
 -- =====================================================
 -- DUMMY DATA
 -- =====================================================
@@ -318,3 +145,8 @@ INSERT INTO events (
     FALSE,
     FALSE
 );
+
+-- explicit ids above don't advance the SERIAL sequences
+SELECT setval('menu_categories_id_seq', (SELECT MAX(id) FROM menu_categories));
+SELECT setval('menu_items_id_seq', (SELECT MAX(id) FROM menu_items));
+SELECT setval('locations_id_seq', (SELECT MAX(id) FROM locations));